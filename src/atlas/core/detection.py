@@ -1,6 +1,7 @@
 """Language, framework, and database detection engine."""
 
 import os
+import re
 
 from atlas.core.models import Infrastructure, ProjectDetection
 from atlas.core.system import detect_system_tools
@@ -94,6 +95,15 @@ _FRAMEWORK_PATTERNS: dict[str, tuple[str, str]] = {
     "react-native": ("typescript", "ts-mobile"),
 }
 
+# One pass over the dependency text finds every framework. Names are
+# whole-word matches, tried longest first so "react-native" is not also
+# reported as "react".
+_FRAMEWORK_RE = re.compile(
+    r"\b("
+    + "|".join(re.escape(f) for f in sorted(_FRAMEWORK_PATTERNS, key=len, reverse=True))
+    + r")\b"
+)
+
 _DATABASE_PATTERNS: list[str] = [
     "sqlalchemy",
     "alembic",
@@ -131,22 +141,67 @@ _TOOL_MARKERS: dict[str, list[str]] = {
     "docker": ["Dockerfile", "docker-compose.yml", "docker-compose.yaml"],
 }
 
+_DEPENDENCY_FILES: tuple[str, ...] = (
+    "pyproject.toml",
+    "requirements.txt",
+    "package.json",
+)
+
 
 # --- Internal helpers ---
+#
+# All filesystem access goes through _list_entries, _is_dir and _read_file_safe
+# so tests can substitute an in-memory view of a project.
+
+
+def _list_entries(path: str) -> set[str]:
+    """Return the names of the direct children of a directory."""
+    return set(os.listdir(path))
+
+
+def _is_dir(path: str) -> bool:
+    """Return True if path is an existing directory."""
+    return os.path.isdir(path)
 
 
 def _read_file_safe(path: str) -> str:
-    """Read a file and return its contents, or empty string on any error."""
+    """Read a file and return its contents, or empty string on any error.
+
+    The file is read as raw bytes and decoded in one call, skipping the text
+    I/O layer; detection only does substring and regex matching on ASCII
+    markers, so newline translation is not needed.
+    """
     try:
-        with open(path, encoding="utf-8", errors="ignore") as f:
-            return f.read()
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", errors="ignore")
     except OSError:
         return ""
 
 
-def _detect_languages(project_dir: str) -> tuple[list[str], str]:
+def _read_manifests(
+    project_dir: str, entries: set[str] | None = None
+) -> dict[str, str]:
+    """Read every dependency manifest present in the project, keyed by filename."""
+    if entries is None:
+        entries = _list_entries(project_dir)
+    return {
+        fname: _read_file_safe(os.path.join(project_dir, fname))
+        for fname in _DEPENDENCY_FILES
+        if fname in entries
+    }
+
+
+def _read_dependency_content(project_dir: str, entries: set[str] | None = None) -> str:
+    """Concatenate the contents of every dependency manifest in the project."""
+    return "".join(_read_manifests(project_dir, entries).values())
+
+
+def _detect_languages(
+    project_dir: str, entries: set[str] | None = None
+) -> tuple[list[str], str]:
     """Detect languages present in the project. Returns (languages, primary)."""
-    entries = set(os.listdir(project_dir))
+    if entries is None:
+        entries = _list_entries(project_dir)
     languages: list[str] = []
 
     for lang, markers in _LANGUAGE_MARKERS.items():
@@ -186,27 +241,35 @@ def _detect_languages(project_dir: str) -> tuple[list[str], str]:
     return languages, primary
 
 
-def _detect_package_manager(project_dir: str, languages: list[str]) -> str:
+def _detect_package_manager(
+    project_dir: str, languages: list[str], entries: set[str] | None = None
+) -> str:
     """Detect package manager from lock files."""
-    entries = set(os.listdir(project_dir))
+    if entries is None:
+        entries = _list_entries(project_dir)
     for lock_file, manager in _LOCK_FILE_MANAGERS.items():
         if lock_file in entries:
             return manager
     return "none"
 
 
-def _detect_existing_tools(project_dir: str) -> list[str]:
-    """Detect tools already configured in the project."""
-    entries = set(os.listdir(project_dir))
-    found: list[str] = []
+def _detect_existing_tools(
+    project_dir: str,
+    entries: set[str] | None = None,
+    manifests: dict[str, str] | None = None,
+) -> list[str]:
+    """Detect tools already configured in the project.
 
-    pyproject_content = ""
-    if "pyproject.toml" in entries:
-        pyproject_content = _read_file_safe(os.path.join(project_dir, "pyproject.toml"))
+    ``manifests`` may be passed pre-read (see ``_read_manifests``).
+    """
+    if entries is None:
+        entries = _list_entries(project_dir)
+    if manifests is None:
+        manifests = _read_manifests(project_dir, entries)
+    found: list[str] = []
 
-    package_content = ""
-    if "package.json" in entries:
-        package_content = _read_file_safe(os.path.join(project_dir, "package.json"))
+    pyproject_content = manifests.get("pyproject.toml", "")
+    package_content = manifests.get("package.json", "")
 
     for tool, markers in _TOOL_MARKERS.items():
         for marker in markers:
@@ -223,21 +286,24 @@ def _detect_existing_tools(project_dir: str) -> list[str]:
 
 
 def _detect_frameworks_and_stack(
-    project_dir: str, languages: list[str]
+    project_dir: str,
+    languages: list[str],
+    content: str | None = None,
+    entries: set[str] | None = None,
 ) -> tuple[list[str], str]:
-    """Detect frameworks and infer the project stack."""
-    entries = set(os.listdir(project_dir))
+    """Detect frameworks and infer the project stack.
+
+    ``content`` may be passed pre-read (see ``_read_dependency_content``).
+    """
     frameworks: list[str] = []
     stack = ""
 
-    # Read dependency files
-    content = ""
-    for fname in ("pyproject.toml", "requirements.txt", "package.json"):
-        if fname in entries:
-            content += _read_file_safe(os.path.join(project_dir, fname))
+    if content is None:
+        content = _read_dependency_content(project_dir, entries)
+    matched = set(_FRAMEWORK_RE.findall(content))
 
     for framework, (lang, candidate_stack) in _FRAMEWORK_PATTERNS.items():
-        if lang in languages and framework in content:
+        if lang in languages and framework in matched:
             frameworks.append(framework)
             if not stack:
                 stack = candidate_stack
@@ -258,22 +324,35 @@ def _detect_frameworks_and_stack(
     return frameworks, stack
 
 
-def _detect_databases(project_dir: str, languages: list[str]) -> list[str]:
-    """Detect databases from dependency files."""
-    entries = set(os.listdir(project_dir))
-    content = ""
-    for fname in ("pyproject.toml", "requirements.txt", "package.json"):
-        if fname in entries:
-            content += _read_file_safe(os.path.join(project_dir, fname))
+def _detect_databases(
+    project_dir: str,
+    languages: list[str],
+    content: str | None = None,
+    entries: set[str] | None = None,
+) -> list[str]:
+    """Detect databases from dependency files.
+
+    ``content`` may be passed pre-read (see ``_read_dependency_content``) to
+    match against it directly instead of reading the manifests from disk.
+    """
+    if content is None:
+        content = _read_dependency_content(project_dir, entries)
 
     return [db for db in _DATABASE_PATTERNS if db in content]
 
 
-def _detect_infrastructure(project_dir: str) -> Infrastructure:
+def _detect_infrastructure(
+    project_dir: str, entries: set[str] | None = None
+) -> Infrastructure:
     """Detect presence of infrastructure files."""
-    entries = set(os.listdir(project_dir))
-    github_dir = os.path.join(project_dir, ".github")
-    workflows_dir = os.path.join(github_dir, "workflows")
+    if entries is None:
+        entries = _list_entries(project_dir)
+
+    # Only stat what the root listing says exists.
+    github_dir = ".github" in entries and _is_dir(os.path.join(project_dir, ".github"))
+    github_actions = github_dir and _is_dir(
+        os.path.join(project_dir, ".github", "workflows")
+    )
 
     return Infrastructure(
         git=".git" in entries,
@@ -281,19 +360,22 @@ def _detect_infrastructure(project_dir: str) -> Infrastructure:
         dockerfile="Dockerfile" in entries,
         docker_compose="docker-compose.yml" in entries
         or "docker-compose.yaml" in entries,
-        github_actions=os.path.isdir(workflows_dir),
-        github_dir=os.path.isdir(github_dir),
+        github_actions=github_actions,
+        github_dir=github_dir,
         gitlab_ci=".gitlab-ci.yml" in entries,
     )
 
 
-def _detect_structure(project_dir: str) -> tuple[str, str]:
+def _detect_structure(
+    project_dir: str, entries: set[str] | None = None
+) -> tuple[str, str]:
     """Detect project structure type and workspace manager.
 
     Returns (structure_type, workspace_manager).
     structure_type: 'single' | 'monorepo' | 'fullstack'
     """
-    entries = set(os.listdir(project_dir))
+    if entries is None:
+        entries = _list_entries(project_dir)
 
     # Check for workspace managers
     for marker, manager in _WORKSPACE_MANAGERS.items():
@@ -302,7 +384,9 @@ def _detect_structure(project_dir: str) -> tuple[str, str]:
 
     # Check for fullstack layout (both frontend+backend dirs present)
     found_dirs = [
-        d for d in _FULLSTACK_DIRS if os.path.isdir(os.path.join(project_dir, d))
+        d
+        for d in _FULLSTACK_DIRS
+        if d in entries and _is_dir(os.path.join(project_dir, d))
     ]
     if len(found_dirs) >= 2:
         return "fullstack", "none"
@@ -324,16 +408,25 @@ def detect_project(project_dir: str) -> ProjectDetection:
     """
     project_dir = os.path.abspath(project_dir)
 
-    if not os.path.isdir(project_dir):
+    if not _is_dir(project_dir):
         return ProjectDetection()
 
-    languages, primary = _detect_languages(project_dir)
-    package_manager = _detect_package_manager(project_dir, languages)
-    existing_tools = _detect_existing_tools(project_dir)
-    frameworks, stack = _detect_frameworks_and_stack(project_dir, languages)
-    databases = _detect_databases(project_dir, languages)
-    infrastructure = _detect_infrastructure(project_dir)
-    structure_type, workspace_manager = _detect_structure(project_dir)
+    # List the root once; every detector works from the same snapshot.
+    entries = _list_entries(project_dir)
+
+    languages, primary = _detect_languages(project_dir, entries)
+    package_manager = _detect_package_manager(project_dir, languages, entries)
+    # Read each dependency manifest once and share it between detectors.
+    manifests = _read_manifests(project_dir, entries)
+    dependency_content = "".join(manifests.values())
+
+    existing_tools = _detect_existing_tools(project_dir, entries, manifests)
+    frameworks, stack = _detect_frameworks_and_stack(
+        project_dir, languages, content=dependency_content
+    )
+    databases = _detect_databases(project_dir, languages, content=dependency_content)
+    infrastructure = _detect_infrastructure(project_dir, entries)
+    structure_type, workspace_manager = _detect_structure(project_dir, entries)
 
     return ProjectDetection(
         languages=languages,
@@ -198,7 +198,7 @@ def detect_new_tools(
 
         # Check detect_files: any of these files exist in project_dir?
         for filename in mod_info.get("detect_files", []):
-            if os.path.exists(os.path.join(project_dir, filename)):
+            if _exists(os.path.join(project_dir, filename)):
                 suggestions.append(module_name)
                 break
         else:
@@ -218,17 +218,30 @@ def _config_matches(detect_in_config: dict, project_dir: str) -> bool:
     if not detect_in_config:
         return False
     for filename, substring in detect_in_config.items():
-        filepath = os.path.join(project_dir, filename)
-        if os.path.isfile(filepath):
-            try:
-                content = open(filepath).read()
-                if substring in content:
-                    return True
-            except OSError:
-                pass
+        content = _read_text_safe(os.path.join(project_dir, filename))
+        if content is not None and substring in content:
+            return True
     return False
 
 
+# Project file probes used by tool detection. Kept as separate helpers so
+# tests can serve a project from memory instead of disk.
+
+
+def _exists(path: str) -> bool:
+    """Return True if *path* exists (file or directory)."""
+    return os.path.exists(path)
+
+
+def _read_text_safe(path: str) -> str | None:
+    """Return the text of the file at *path*, or ``None`` if it cannot be read."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
 def detect_removed_tools(
     registry: dict,
     installed_modules: dict,
@@ -267,9 +280,7 @@ def detect_removed_tools(
             continue
 
         # If any detect_files exist, still present
-        if any(
-            os.path.exists(os.path.join(project_dir, f)) for f in detect_files
-        ):
+        if any(_exists(os.path.join(project_dir, f)) for f in detect_files):
             continue
 
         # If any detect_in_config matches, still present
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
+import re
 from datetime import datetime, timezone
 
 from atlas.core.errors import error_result, ok_result
@@ -74,6 +76,13 @@ PKG_VARIABLES: dict[str, dict[str, str]] = {
     },
 }
 
+# Matches any placeholder named in PKG_VARIABLES; one scan resolves all of them.
+_PLACEHOLDER_RE = re.compile(
+    r"\{\{("
+    + "|".join(map(re.escape, sorted({k for v in PKG_VARIABLES.values() for k in v})))
+    + r")\}\}"
+)
+
 
 def resolve_pkg_variables(text: str, package_manager: str) -> str:
     """Replace ``{{pkg_run}}``, ``{{pkg_add}}``, ``{{pkg_add_dev}}``,
@@ -81,12 +90,12 @@ def resolve_pkg_variables(text: str, package_manager: str) -> str:
     *package_manager*.
 
     Falls back to the ``pip`` template when *package_manager* is unknown.
-    Unknown placeholder tokens are left unchanged.
+    Unknown placeholder tokens, and placeholders the manager's template does
+    not define, are left unchanged.  *text* is scanned once, so a
+    substituted command is never itself re-expanded.
     """
     variables = PKG_VARIABLES.get(package_manager, PKG_VARIABLES["pip"])
-    for var_name, replacement in variables.items():
-        text = text.replace("{{" + var_name + "}}", replacement)
-    return text
+    return _PLACEHOLDER_RE.sub(lambda m: variables.get(m.group(1), m.group(0)), text)
 
 
 # ---------------------------------------------------------------------------
@@ -117,7 +126,7 @@ def install_module(
     or an ``error_result`` on the first validation failure.
     """
     # 1. Validate
-    installed = list(manifest.get("installed_modules", {}).keys())
+    installed = manifest.get("installed_modules", {})
 
     reg_entry = find_module(registry, module_name)
     if not reg_entry:
@@ -126,7 +135,7 @@ def install_module(
     if module_name in installed:
         return error_result("MODULE_ALREADY_INSTALLED", module_name)
 
-    conflicts = check_conflicts(registry, module_name, installed)
+    conflicts = check_conflicts(registry, module_name, list(installed))
     if conflicts:
         return error_result(
             "MODULE_CONFLICT",
@@ -167,11 +176,7 @@ def install_module(
     # 6. Write to .atlas/modules/<name>.json.
     modules_dir = os.path.join(atlas_dir, "modules")
     os.makedirs(modules_dir, exist_ok=True)
-    module_path = os.path.join(modules_dir, f"{module_name}.json")
-    rules["synced_at"] = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    with open(module_path, "w") as f:
-        json.dump(rules, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+    _write_module_file(modules_dir, module_name, rules)
 
     # 7. Update manifest.
     manifest.setdefault("installed_modules", {})[module_name] = {
@@ -182,6 +187,29 @@ def install_module(
     return ok_result(installed=module_name, warnings=[])
 
 
+def _write_module_file(modules_dir: str, module_name: str, rules: dict) -> None:
+    """Stamp *rules* with ``synced_at`` and write ``<modules_dir>/<name>.json``.
+
+    The document is serialized in one ``json.dumps`` call and written with a
+    single ``write``; ``json.dump`` would feed the file many small chunks.
+    It goes to a sibling ``.tmp`` file first and is moved into place with
+    ``os.replace``, so an interrupted write never leaves a truncated file;
+    on failure the ``.tmp`` file is removed and the error re-raised.
+    """
+    rules["synced_at"] = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    text = json.dumps(rules, indent=2, ensure_ascii=False) + "\n"
+    path = os.path.join(modules_dir, f"{module_name}.json")
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
 def remove_module(
     module_name: str,
     registry: dict,
@@ -233,21 +261,23 @@ def _find_orphaned_tasks(module_name: str, config: dict) -> list[str]:
 
     Tasks are stored in ``config["tasks"]`` as either a command string or
     a list of task-name strings (chain).  A task is considered orphaned
-    when *module_name* appears as a substring of any command string in the
-    task's definition.
+    when *module_name* appears as a whole word (not inside a longer name
+    such as ``go`` in ``cargo``) in any command string of the task's
+    definition.
     """
     tasks = config.get("tasks", {})
     if not isinstance(tasks, dict):
         return []
 
+    pattern = re.compile(r"(?<![\w-])" + re.escape(module_name) + r"(?![\w-])")
     orphaned: list[str] = []
     for task_name, command in tasks.items():
         if isinstance(command, str):
-            if module_name in command:
+            if pattern.search(command):
                 orphaned.append(task_name)
         elif isinstance(command, list):
             # Chain: list of command strings or task-name references
-            if any(module_name in str(c) for c in command):
+            if any(pattern.search(str(c)) for c in command):
                 orphaned.append(task_name)
     return orphaned
 
@@ -322,11 +352,7 @@ def update_modules(
                 }
 
         # Overwrite module file.
-        module_path = os.path.join(modules_dir, f"{module_name}.json")
-        rules["synced_at"] = datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-        with open(module_path, "w") as f:
-            json.dump(rules, f, indent=2, ensure_ascii=False)
-            f.write("\n")
+        _write_module_file(modules_dir, module_name, rules)
 
         # Update manifest version.
         manifest["installed_modules"][module_name]["version"] = warehouse_version
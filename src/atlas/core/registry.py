@@ -12,12 +12,12 @@ def load_registry(registry_path: str) -> dict:
     Returns an empty dict if the file does not exist, cannot be read,
     or contains invalid JSON.
     """
-    if not os.path.isfile(registry_path):
-        return {}
+    # Hand json the raw bytes: it detects UTF-8 itself, skipping the text
+    # layer. ValueError covers both JSONDecodeError and undecodable bytes.
     try:
-        with open(registry_path) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
+        with open(registry_path, "rb") as f:
+            return json.loads(f.read())
+    except (ValueError, OSError):
         return {}
 
 
@@ -50,7 +50,8 @@ def check_conflicts(
         if module_name in modules.get(name, {}).get("conflicts_with", [])
     }
 
-    return [c for c in installed if c in (forward | reverse)]
+    conflicting = forward | reverse
+    return [c for c in installed if c in conflicting]
 
 
 def get_dependencies(registry: dict, module_name: str) -> list[str]:
@@ -258,13 +259,10 @@ def load_module_bundle(
         return {}
 
     module_json = os.path.join(warehouse_dir, module_path, "module.json")
-    if not os.path.isfile(module_json):
-        return {}
-
     try:
-        with open(module_json) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
+        with open(module_json, "rb") as f:
+            return json.loads(f.read())
+    except (ValueError, OSError):
         return {}
 
 
@@ -19,8 +19,13 @@ VERBS: frozenset[str] = frozenset({
 
 RESOURCE_TYPES: frozenset[str] = frozenset({"note", "prompt", "task", "scope"})
 
+# Verbs that take a resource_type, mapped to how many words must follow the
+# verb for the first of them to be read as one.  ``remove`` needs two so that
+# ``remove note`` still removes a module called "note".
+_RESOURCE_VERBS: dict[str, int] = {"create": 1, "edit": 1, "remove": 2}
 
-@dataclass
+
+@dataclass(slots=True)
 class ParsedInput:
     """Structured representation of a single atlas tool invocation."""
 
@@ -43,12 +48,13 @@ def parse_input(raw: str) -> ParsedInput:
     """
     raw = raw.strip()
     result = ParsedInput()
+    if not raw:
+        return result
 
-    # Split on " -- " for agent passthrough
-    if " -- " in raw:
-        atlas_part, result.message = raw.split(" -- ", 1)
-    else:
-        atlas_part = raw
+    # Split on the first " -- " for agent passthrough (one scan, no list).
+    atlas_part, sep, message = raw.partition(" -- ")
+    if sep:
+        result.message = message
 
     words = atlas_part.split()
     if not words:
@@ -57,19 +63,22 @@ def parse_input(raw: str) -> ParsedInput:
     first = words[0].lower()
     if first in VERBS:
         result.verb = first
-        rest = words[1:]
-
-        if result.verb in ("create", "edit") and rest and rest[0] in RESOURCE_TYPES:
-            result.resource_type = rest[0]
-            result.args = rest[1:]
-        elif result.verb == "remove" and len(rest) >= 2 and rest[0] in RESOURCE_TYPES:
-            result.resource_type = rest[0]
-            result.args = rest[1:]
+
+        # Index into words rather than slicing off a ``rest`` list first, so
+        # args is the only list built.
+        min_words = _RESOURCE_VERBS.get(first, 0)
+        if min_words and len(words) > min_words and words[1] in RESOURCE_TYPES:
+            result.resource_type = words[1]
+            result.args = words[2:]
         else:
-            result.args = rest
+            result.args = words[1:]
+    elif "," not in atlas_part:
+        # No verb → context query.  Without a comma the words already split
+        # above are the single group.
+        result.contexts = [words]
     else:
-        # No verb → context query: split by comma, then by space
-        groups = [g.strip() for g in atlas_part.split(",")]
-        result.contexts = [g.split() for g in groups if g]
+        # Split by comma, then by space.  split() drops the whitespace around
+        # each group and yields [] for blank ones, so no strip pass is needed.
+        result.contexts = [ws for g in atlas_part.split(",") if (ws := g.split())]
 
     return result
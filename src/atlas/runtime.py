@@ -10,6 +10,7 @@ import json
 import os
 import subprocess
 import time
+from bisect import bisect_right
 
 from atlas.core.categories import CategoryRouter
 from atlas.core.config import AtlasConfig, load_config
@@ -24,16 +25,95 @@ from atlas.core.retrieve import (
 from atlas.core.runner import augment_errors, run_task
 
 
+# --no-optional-locks keeps git from taking .git/index.lock to refresh the
+# index, so a concurrent commit never collides with the session brief, and
+# --untracked-files=no skips the work-tree scan whose results are discarded.
+_GIT_STATUS_ARGV = (
+    "git",
+    "--no-optional-locks",
+    "status",
+    "--porcelain=v2",
+    "--branch",
+    "-z",
+    "--untracked-files=no",
+)
+
+# Field index of the path in ``git status --porcelain=v2`` change records:
+# ordinary ("1"), renamed/copied ("2") and unmerged ("u").
+_PORCELAIN_PATH_FIELD = {"1": 8, "2": 9, "u": 10}
+
+
+# Unit sizes in seconds for _relative_time, ascending; anything under the
+# first is "just now".
+_RELATIVE_STEPS = (60, 3600, 86400)
+_RELATIVE_UNITS = ("m", "h", "d")
+
+
 def _relative_time(ts: float, now: float) -> str:
     """Return a human-readable relative time string (e.g. '2h ago')."""
     delta = int(now - ts)
-    if delta < 60:
+    i = bisect_right(_RELATIVE_STEPS, delta)
+    if i == 0:
         return "just now"
-    if delta < 3600:
-        return f"{delta // 60}m ago"
-    if delta < 86400:
-        return f"{delta // 3600}h ago"
-    return f"{delta // 86400}d ago"
+    return f"{delta // _RELATIVE_STEPS[i - 1]}{_RELATIVE_UNITS[i - 1]} ago"
+
+
+# Block size for reading history.jsonl backwards from EOF.
+_TAIL_BLOCK = 64 * 1024
+
+
+def _tail_lines(path: str, limit: int) -> list[bytes]:
+    """Return the last *limit* non-blank lines of the file at *path*.
+
+    Reads fixed-size blocks backwards from EOF and stops once enough complete
+    lines are buffered, so the cost follows *limit* rather than file size.
+    Raises ``OSError`` if the file cannot be read.
+    """
+    if limit <= 0:
+        return []
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while True:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            lines = data.split(b"\n")
+            if pos > 0:
+                lines = lines[1:]  # may start mid-line; re-read with the next block
+            lines = [ln for ln in lines if ln.strip()]
+            if pos == 0 or len(lines) >= limit:
+                return lines[-limit:]
+
+
+def _parse_git_status(out: str) -> tuple[str, str, list[str], list[str]]:
+    """Split ``git status --porcelain=v2 --branch -z`` output.
+
+    Returns ``(branch, ahead_behind, unstaged, staged)``; *ahead_behind* is the
+    raw ``"+<ahead> -<behind>"`` header, empty when there is no upstream.
+    Untracked and ignored entries are skipped.
+    """
+    branch = ""
+    ahead_behind = ""
+    unstaged: list[str] = []
+    staged: list[str] = []
+    records = iter(out.split("\0"))
+    for record in records:
+        if record.startswith("# branch.head "):
+            branch = record[len("# branch.head "):]
+        elif record.startswith("# branch.ab "):
+            ahead_behind = record[len("# branch.ab "):]
+        elif record[:1] in _PORCELAIN_PATH_FIELD:
+            fields = record.split(" ", _PORCELAIN_PATH_FIELD[record[0]])
+            if record[0] == "2":
+                next(records, None)  # rename/copy source path
+            xy, path = fields[1], fields[-1]
+            if xy[0] != ".":
+                staged.append(path)
+            if xy[1] != ".":
+                unstaged.append(path)
+    return branch, ahead_behind, unstaged, staged
 
 
 class Atlas:
@@ -425,19 +505,16 @@ class Atlas:
     def _read_recent_history(self, limit: int = 5) -> list[dict]:
         """Return the last *limit* entries from history.jsonl with relative timestamps."""
         path = os.path.join(self.atlas_dir, "history.jsonl")
-        if not os.path.isfile(path):
-            return []
         try:
-            with open(path) as f:
-                lines = [ln.strip() for ln in f if ln.strip()]
-        except OSError:
+            lines = _tail_lines(path, limit)
+        except OSError:  # missing, a directory, or unreadable
             return []
         now = time.time()
         entries = []
-        for line in lines[-limit:]:
+        for line in lines:
             try:
                 record = json.loads(line)
-            except json.JSONDecodeError:
+            except ValueError:  # malformed JSON or undecodable bytes
                 continue
             summary = record.get("summary", "")
             if not summary:
@@ -448,54 +525,43 @@ class Atlas:
         return entries
 
     def _quick_git_status(self) -> str:
-        """Return a formatted git status string for the session brief."""
-        def _run(cmd: list[str]) -> str:
-            try:
-                return subprocess.check_output(
-                    cmd,
-                    cwd=self.project_dir,
-                    stderr=subprocess.DEVNULL,
-                    timeout=3,
-                ).decode().strip()
-            except Exception:
-                return ""
-
-        branch = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-        if not branch or branch == "HEAD":
+        """Return a formatted git status string for the session brief.
+
+        A single ``git status --porcelain=v2 --branch -z`` call supplies the
+        branch, ahead/behind counts, and the staged and unstaged file lists.
+        """
+        try:
+            out = subprocess.check_output(
+                _GIT_STATUS_ARGV,
+                cwd=self.project_dir,
+                stderr=subprocess.DEVNULL,
+                timeout=3,
+            ).decode("utf-8", errors="replace")  # paths need not be UTF-8
+        except Exception:
             return ""
 
-        lines: list[str] = []
+        branch, ahead_behind, unstaged, staged = _parse_git_status(out)
+        if not branch or branch == "(detached)":
+            return ""
 
-        # Ahead/behind vs upstream
-        counts = _run(["git", "rev-list", "--left-right", "--count", "HEAD...@{upstream}"])
-        if counts:
-            try:
-                parts = counts.split()
-                ahead, behind = int(parts[0]), int(parts[1])
-                suffix = ""
-                if ahead and behind:
-                    suffix = f" ({ahead} ahead, {behind} behind)"
-                elif ahead:
-                    suffix = f" ({ahead} ahead)"
-                elif behind:
-                    suffix = f" ({behind} behind)"
-                lines.append(f"  Branch: {branch}{suffix}")
-            except (ValueError, IndexError):
-                lines.append(f"  Branch: {branch}")
-        else:
-            lines.append(f"  Branch: {branch}")
+        # Ahead/behind vs upstream ("+<ahead> -<behind>", absent without one)
+        suffix = ""
+        try:
+            ahead, behind = (abs(int(n)) for n in ahead_behind.split())
+        except ValueError:
+            ahead = behind = 0
+        if ahead and behind:
+            suffix = f" ({ahead} ahead, {behind} behind)"
+        elif ahead:
+            suffix = f" ({ahead} ahead)"
+        elif behind:
+            suffix = f" ({behind} behind)"
+        lines: list[str] = [f"  Branch: {branch}{suffix}"]
 
-        # Unstaged modifications
-        unstaged = _run(["git", "diff", "--name-only"])
         if unstaged:
-            files = ", ".join(unstaged.splitlines())
-            lines.append(f"  Modified (unstaged): {files}")
-
-        # Staged changes
-        staged = _run(["git", "diff", "--cached", "--name-only"])
+            lines.append(f"  Modified (unstaged): {', '.join(unstaged)}")
         if staged:
-            files = ", ".join(staged.splitlines())
-            lines.append(f"  Staged: {files}")
+            lines.append(f"  Staged: {', '.join(staged)}")
 
         return "\n".join(lines)
 
@@ -562,9 +628,14 @@ class Atlas:
         if not self.is_initialized:
             return
         path = os.path.join(self.atlas_dir, "history.jsonl")
-        record = json.dumps({"ts": time.time(), "summary": summary})
+        record = json.dumps({"ts": time.time(), "summary": summary}) + "\n"
+        # One unbuffered O_APPEND write per record: concurrent writers (CLI
+        # and MCP server) can't interleave partial lines.
         try:
-            with open(path, "a") as f:
-                f.write(record + "\n")
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record.encode())
+            finally:
+                os.close(fd)
         except OSError:
             pass
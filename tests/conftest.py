@@ -0,0 +1,162 @@
+"""Shared pytest configuration for the Atlas test suite."""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from types import MappingProxyType
+
+import pytest
+
+from atlas.core import detection, drift
+from atlas.runtime import Atlas
+
+
+# Most tests build small throwaway projects under tmp_path. On Linux, back
+# pytest's temp root with tmpfs so those writes never touch a real disk. An
+# explicit TMPDIR in the environment always wins.
+if (
+    sys.platform == "linux"
+    and "TMPDIR" not in os.environ
+    and os.access("/dev/shm", os.W_OK)
+):
+    os.environ["TMPDIR"] = "/dev/shm"
+    tempfile.tempdir = None  # forget any gettempdir() result cached before now
+
+
+@pytest.fixture(scope="session")
+def session_root(tmp_path_factory) -> Path:
+    """One base directory shared by every test in the session."""
+    return tmp_path_factory.mktemp("projects", numbered=False)
+
+
+@pytest.fixture
+def fresh_dir(session_root: Path, request) -> Iterator[Path]:
+    """Create an empty per-test directory under ``session_root``.
+
+    Cheaper than ``tmp_path``: no numbered directory per test, and only this
+    test's subtree is removed on teardown.
+    """
+    path = session_root / re.sub(r"[^\w.-]", "_", request.node.nodeid)
+    path.mkdir()
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class MemoryProject(dict):
+    """Relative path → file content map standing in for a project on disk.
+
+    Directories exist implicitly as parents of any key.
+    """
+
+    root = "/project"
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.root)
+
+    def _children_prefix(self, path: str) -> str:
+        rel = self._rel(path)
+        return "" if rel == "." else rel + "/"
+
+    def is_dir(self, path: str) -> bool:
+        prefix = self._children_prefix(path)
+        return any(key.startswith(prefix) for key in self)
+
+    def path_exists(self, path: str) -> bool:
+        return self._rel(path) in self or self.is_dir(path)
+
+    def list_entries(self, path: str) -> set[str]:
+        prefix = self._children_prefix(path)
+        return {key[len(prefix):].split("/")[0] for key in self if key.startswith(prefix)}
+
+    def read_text(self, path: str) -> str | None:
+        return self.get(self._rel(path))
+
+    def read_text_or_empty(self, path: str) -> str:
+        return self.get(self._rel(path), "")
+
+
+@pytest.fixture
+def memory_project(monkeypatch) -> MemoryProject:
+    """Serve the drift and detection file probes from memory."""
+    project = MemoryProject()
+    monkeypatch.setattr(drift, "_exists", project.path_exists)
+    monkeypatch.setattr(drift, "_read_text_safe", project.read_text)
+    monkeypatch.setattr(detection, "_list_entries", project.list_entries)
+    monkeypatch.setattr(detection, "_is_dir", project.is_dir)
+    monkeypatch.setattr(detection, "_read_file_safe", project.read_text_or_empty)
+    return project
+
+
+# Detectable tools shared by the drift tests. clippy has no detection
+# criteria, so it is always considered present.
+_TOOL_MODULES = {
+    "ruff": {
+        "detect_files": ("ruff.toml",),
+        "detect_in_config": {"pyproject.toml": "[tool.ruff]"},
+    },
+    "mypy": {"detect_files": (), "detect_in_config": {"pyproject.toml": "[tool.mypy]"}},
+    "eslint": {"detect_files": (".eslintrc.json",), "detect_in_config": {}},
+    "git": {"detect_files": (".git",), "detect_in_config": {}},
+    "clippy": {"detect_files": (), "detect_in_config": {}},
+}
+
+
+@pytest.fixture(scope="session")
+def tool_registry() -> MappingProxyType:
+    """Read-only registry of ``_TOOL_MODULES``, built once per session."""
+    modules = {
+        name: MappingProxyType(
+            {**info, "detect_in_config": MappingProxyType(info["detect_in_config"])}
+        )
+        for name, info in _TOOL_MODULES.items()
+    }
+    return MappingProxyType({"modules": MappingProxyType(modules)})
+
+
+def _make_atlas_dir(root: Path, *subdirs: str) -> Path:
+    """Create ``.atlas/`` under *root*, plus each of *subdirs* inside it.
+
+    Every ``.atlas`` fixture below is built by this one function.
+    """
+    atlas_dir = root / ".atlas"
+    atlas_dir.mkdir()
+    for sub in subdirs:
+        (atlas_dir / sub).mkdir()
+    return atlas_dir
+
+
+def _atlas_layout(root: Path) -> tuple[Path, Path, Path]:
+    """Create ``.atlas/modules`` and ``project`` under *root*."""
+    atlas_dir = _make_atlas_dir(root, "modules")
+    project_dir = root / "project"
+    project_dir.mkdir()
+    return atlas_dir, atlas_dir / "modules", project_dir
+
+
+@pytest.fixture(scope="session")
+def make_atlas_layout():
+    """Return the layout builder, for fixtures that pick their own root."""
+    return _atlas_layout
+
+
+@pytest.fixture
+def atlas_layout(fresh_dir: Path) -> tuple[Path, Path, Path]:
+    """``(atlas_dir, modules_dir, project_dir)`` laid out in a fresh directory."""
+    return _atlas_layout(fresh_dir)
+
+
+@pytest.fixture
+def atlas_dir(fresh_dir: Path) -> Path:
+    """An ``.atlas/`` with empty ``modules/`` and ``retrieve/`` in ``fresh_dir``."""
+    return _make_atlas_dir(fresh_dir, "modules", "retrieve")
+
+
+@pytest.fixture
+def atlas(fresh_dir: Path) -> Atlas:
+    """An ``Atlas`` for an initialized (``.atlas/`` present) project in fresh_dir."""
+    _make_atlas_dir(fresh_dir)
+    return Atlas(project_dir=str(fresh_dir))
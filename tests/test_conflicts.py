@@ -85,23 +85,19 @@ class TestType1ModuleConflicts:
 
     # -- unit gaps --
 
-    def test_conflict_error_contains_conflicting_module_name(self, tmp_path):
+    def test_conflict_error_contains_conflicting_module_name(self, fresh_dir, atlas_dir):
         """The error detail from install_module names the conflicting module."""
-        atlas_dir = tmp_path / ".atlas"
-        atlas_dir.mkdir()
         manifest = {"installed_modules": {"flake8": {"category": "linter"}}}
         result = install_module(
-            "ruff", self._registry(), str(tmp_path), str(atlas_dir), manifest
+            "ruff", self._registry(), str(fresh_dir), str(atlas_dir), manifest
         )
         assert "flake8" in result["detail"]
 
-    def test_no_conflict_when_different_category(self, tmp_path):
+    def test_no_conflict_when_different_category(self, fresh_dir, atlas_dir):
         """Installing a module when no conflict exists between it and installed modules succeeds."""
-        atlas_dir = tmp_path / ".atlas"
-        (atlas_dir / "modules").mkdir(parents=True)
         manifest = {"installed_modules": {"eslint": {"category": "linter"}}}
         result = install_module(
-            "pytest", self._registry(), str(tmp_path), str(atlas_dir), manifest
+            "pytest", self._registry(), str(fresh_dir), str(atlas_dir), manifest
         )
         assert result["ok"] is True
 
@@ -247,48 +243,42 @@ class TestType3ConfigDrift:
 
     # -- unit: value drift auto-updates the stored snapshot --
 
-    def test_value_drift_detected_when_config_changes(self, tmp_path):
+    def test_value_drift_detected_when_config_changes(self, fresh_dir, atlas_dir):
         """detect_value_drift finds a changed line-length value."""
-        atlas_dir = tmp_path / ".atlas"
         mods_dir = atlas_dir / "modules"
-        mods_dir.mkdir(parents=True)
         (mods_dir / "ruff.json").write_text(
             json.dumps({"id": "ruff", "rules": {"line_length": 120}})
         )
-        (tmp_path / "pyproject.toml").write_text(
+        (fresh_dir / "pyproject.toml").write_text(
             "[tool.ruff]\nline-length = 100\n"
         )
         installed = {"ruff": {}}
-        result = detect_value_drift(installed, str(atlas_dir), str(tmp_path))
+        result = detect_value_drift(installed, str(atlas_dir), str(fresh_dir))
         drifted_names = [item["module"] for item in result["drifted"]]
         assert "ruff" in drifted_names
 
-    def test_no_value_drift_when_config_unchanged(self, tmp_path):
+    def test_no_value_drift_when_config_unchanged(self, fresh_dir, atlas_dir):
         """detect_value_drift returns empty when nothing changed."""
-        atlas_dir = tmp_path / ".atlas"
         mods_dir = atlas_dir / "modules"
-        mods_dir.mkdir(parents=True)
         (mods_dir / "ruff.json").write_text(json.dumps({"id": "ruff", "rules": {}}))
         result = detect_value_drift(
-            {"ruff": {}}, str(atlas_dir), str(tmp_path)
+            {"ruff": {}}, str(atlas_dir), str(fresh_dir)
         )
         drifted_names = [item["module"] for item in result["drifted"]]
         assert "ruff" not in drifted_names
 
-    def test_apply_drift_updates_rewrites_snapshot(self, tmp_path):
+    def test_apply_drift_updates_rewrites_snapshot(self, fresh_dir, atlas_dir):
         """apply_drift_updates rewrites the module snapshot file."""
-        atlas_dir = tmp_path / ".atlas"
         mods_dir = atlas_dir / "modules"
-        mods_dir.mkdir(parents=True)
         (mods_dir / "ruff.json").write_text(
             json.dumps({"id": "ruff", "rules": {"line_length": 120}})
         )
-        (tmp_path / "pyproject.toml").write_text(
+        (fresh_dir / "pyproject.toml").write_text(
             "[tool.ruff]\nline-length = 100\n"
         )
         installed = {"ruff": {}}
-        result = detect_value_drift(installed, str(atlas_dir), str(tmp_path))
-        apply_drift_updates(result["drifted"], str(atlas_dir), str(tmp_path))
+        result = detect_value_drift(installed, str(atlas_dir), str(fresh_dir))
+        apply_drift_updates(result["drifted"], str(atlas_dir), str(fresh_dir))
         assert (mods_dir / "ruff.json").exists()
 
     # -- unit: new tool detection suggests add --
@@ -320,20 +310,18 @@ class TestType3ConfigDrift:
 
     # -- integration: combined drift flow --
 
-    def test_drift_detect_and_apply_cycle(self, tmp_path):
+    def test_drift_detect_and_apply_cycle(self, fresh_dir, atlas_dir):
         """Full drift cycle: detect value change, apply update, snapshot is refreshed."""
-        atlas_dir = tmp_path / ".atlas"
         mods_dir = atlas_dir / "modules"
-        mods_dir.mkdir(parents=True)
         (mods_dir / "ruff.json").write_text(
             json.dumps({"id": "ruff", "rules": {"line_length": 88}})
         )
-        (tmp_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 120\n")
+        (fresh_dir / "pyproject.toml").write_text("[tool.ruff]\nline-length = 120\n")
         installed = {"ruff": {}}
-        result = detect_value_drift(installed, str(atlas_dir), str(tmp_path))
+        result = detect_value_drift(installed, str(atlas_dir), str(fresh_dir))
         drifted_names = [item["module"] for item in result["drifted"]]
         assert "ruff" in drifted_names, "drift should be detected"
-        apply_drift_updates(result["drifted"], str(atlas_dir), str(tmp_path))
+        apply_drift_updates(result["drifted"], str(atlas_dir), str(fresh_dir))
         assert (mods_dir / "ruff.json").exists()
 
     def test_new_tool_and_removed_tool_independent(self, tmp_path):
@@ -358,26 +346,18 @@ class TestType4TaskOrphaning:
     Spec: plan/05-ATLAS-API.md §27 Type 4
     """
 
-    def _setup(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
-        (atlas_dir / "modules").mkdir(parents=True)
-        (atlas_dir / "retrieve").mkdir(parents=True)
-        return atlas_dir
-
     # -- unit gaps --
 
-    def test_chain_task_with_module_reference_produces_warning(self, tmp_path):
+    def test_chain_task_with_module_reference_produces_warning(self, atlas_dir):
         """A chain task (list) referencing the removed module name is orphaned."""
-        atlas_dir = self._setup(tmp_path)
         manifest = {"installed_modules": {"ruff": {}}}
         config = {"tasks": {"quality": ["typecheck", "uv run ruff format ."]}}
         result = remove_module("ruff", {}, str(atlas_dir), manifest, config=config)
         assert result["ok"] is True
         assert "quality" in result["warnings"]
 
-    def test_task_not_referencing_removed_module_no_warning(self, tmp_path):
+    def test_task_not_referencing_removed_module_no_warning(self, atlas_dir):
         """A task that doesn't reference the removed module has no warning."""
-        atlas_dir = self._setup(tmp_path)
         manifest = {"installed_modules": {"ruff": {}}}
         config = {"tasks": {"test": "uv run pytest", "typecheck": "uv run basedpyright src/"}}
         result = remove_module("ruff", {}, str(atlas_dir), manifest, config=config)
@@ -432,33 +412,24 @@ class TestType5DependencyConflicts:
     Spec: plan/05-ATLAS-API.md §27 Type 5
     """
 
-    def _setup(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
-        (atlas_dir / "modules").mkdir(parents=True)
-        (atlas_dir / "retrieve").mkdir(parents=True)
-        return atlas_dir
-
     # -- unit gaps --
 
-    def test_removal_blocked_when_dependent_present(self, tmp_path):
+    def test_removal_blocked_when_dependent_present(self, atlas_dir):
         """remove_module returns error when another installed module requires it."""
-        atlas_dir = self._setup(tmp_path)
         registry = {"modules": {"commit-rules": {"requires": ["git"]}}}
         manifest = {"installed_modules": {"git": {}, "commit-rules": {}}}
         result = remove_module("git", registry, str(atlas_dir), manifest)
         assert result["ok"] is False
 
-    def test_error_detail_names_the_dependent(self, tmp_path):
+    def test_error_detail_names_the_dependent(self, atlas_dir):
         """The error detail string names the dependent module."""
-        atlas_dir = self._setup(tmp_path)
         registry = {"modules": {"commit-rules": {"requires": ["git"]}}}
         manifest = {"installed_modules": {"git": {}, "commit-rules": {}}}
         result = remove_module("git", registry, str(atlas_dir), manifest)
         assert "commit-rules" in result["detail"]
 
-    def test_removal_succeeds_after_dependent_removed(self, tmp_path):
+    def test_removal_succeeds_after_dependent_removed(self, atlas_dir):
         """Once the dependent is removed, the dependency can be removed."""
-        atlas_dir = self._setup(tmp_path)
         registry = {"modules": {"commit-rules": {"requires": ["git"]}}}
         manifest = {"installed_modules": {"git": {}}}
         result = remove_module("git", registry, str(atlas_dir), manifest)
@@ -523,79 +494,68 @@ class TestType6WarehouseUpdate:
     Spec: plan/05-ATLAS-API.md §27 Type 6
     """
 
-    def _setup(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
-        (atlas_dir / "modules").mkdir(parents=True)
-        return atlas_dir
-
     # -- unit gaps: notes and config survive update --
 
-    def test_notes_file_untouched_after_update(self, tmp_path):
+    def test_notes_file_untouched_after_update(self, fresh_dir, atlas_dir):
         """update_modules does not touch notes.json."""
-        atlas_dir = self._setup(tmp_path)
         notes_path = atlas_dir / "notes.json"
         notes_path.write_text(json.dumps({"python": [{"text": "use async"}]}))
         registry = {"modules": {"ruff": {"category": "linter", "version": "0.5.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert notes_path.exists()
         notes = json.loads(notes_path.read_text())
         assert notes["python"][0]["text"] == "use async"
 
-    def test_config_file_untouched_after_update(self, tmp_path):
+    def test_config_file_untouched_after_update(self, fresh_dir, atlas_dir):
         """update_modules does not touch config.json."""
-        atlas_dir = self._setup(tmp_path)
         config_path = atlas_dir / "config.json"
         config_path.write_text(json.dumps({"tasks": {"lint": "uv run ruff check ."}}))
         registry = {"modules": {"ruff": {"category": "linter", "version": "0.5.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert config_path.exists()
         config = json.loads(config_path.read_text())
         assert config["tasks"]["lint"] == "uv run ruff check ."
 
-    def test_module_version_updated_in_manifest(self, tmp_path):
+    def test_module_version_updated_in_manifest(self, fresh_dir, atlas_dir):
         """After update, the manifest reflects the new warehouse version."""
-        atlas_dir = self._setup(tmp_path)
         registry = {"modules": {"ruff": {"category": "linter", "version": "0.5.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert manifest["installed_modules"]["ruff"]["version"] == "0.5.0"
 
-    def test_custom_prompts_directory_untouched_after_update(self, tmp_path):
+    def test_custom_prompts_directory_untouched_after_update(self, fresh_dir, atlas_dir):
         """update_modules does not delete or overwrite custom prompt files."""
-        atlas_dir = self._setup(tmp_path)
         prompts_dir = atlas_dir / "prompts"
         prompts_dir.mkdir()
         custom_prompt = prompts_dir / "my-security.md"
         custom_prompt.write_text("# My security prompt")
         registry = {"modules": {"ruff": {"category": "linter", "version": "0.5.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert custom_prompt.exists()
         assert custom_prompt.read_text() == "# My security prompt"
 
     # -- integration: full update cycle --
 
-    def test_update_cycle_older_version_updates_module_json(self, tmp_path):
+    def test_update_cycle_older_version_updates_module_json(self, fresh_dir, atlas_dir):
         """Full update: old version in manifest → update_modules → module JSON written."""
-        atlas_dir = self._setup(tmp_path)
         (atlas_dir / "modules" / "ruff.json").write_text(
             json.dumps({"id": "ruff", "version": "0.4.0", "rules": {}})
         )
         registry = {"modules": {"ruff": {"id": "ruff", "category": "linter", "version": "0.5.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        result = update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        result = update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert result["ok"] is True
         assert "ruff" in result["updated"]
         written = json.loads((atlas_dir / "modules" / "ruff.json").read_text())
         assert written["version"] == "0.5.0"
 
-    def test_update_cycle_same_version_not_updated(self, tmp_path):
+    def test_update_cycle_same_version_not_updated(self, fresh_dir, atlas_dir):
         """Module at current version is skipped, not re-written."""
-        atlas_dir = self._setup(tmp_path)
         registry = {"modules": {"ruff": {"category": "linter", "version": "0.4.0"}}}
         manifest = {"installed_modules": {"ruff": {"version": "0.4.0"}}}
-        result = update_modules(registry, str(tmp_path), str(atlas_dir), manifest)
+        result = update_modules(registry, str(fresh_dir), str(atlas_dir), manifest)
         assert "ruff" in result["skipped"]
         assert "ruff" not in result["updated"]
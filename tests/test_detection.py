@@ -1,7 +1,13 @@
 """Tests for atlas.core.detection — parametrized over every data table."""
 
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
 import pytest
 
+from atlas.core import detection
 from atlas.core.detection import (
     _DATABASE_PATTERNS,
     _FRAMEWORK_PATTERNS,
@@ -22,76 +28,81 @@ from atlas.core.detection import (
 from atlas.core.models import ProjectDetection
 
 
+def _make_dirs(root: Path, names: Iterable[str]) -> None:
+    """Create each directory in names under root, with any missing parents."""
+    for name in names:
+        (root / name).mkdir(parents=True)
+
+
 # ---------------------------------------------------------------------------
 # _detect_languages
 # ---------------------------------------------------------------------------
 
 
+def _exact_markers(lang: str) -> list[str]:
+    return [m for m in _LANGUAGE_MARKERS[lang] if not m.startswith("*")]
+
+
+def _glob_markers(lang: str) -> list[str]:
+    return [m for m in _LANGUAGE_MARKERS[lang] if m.startswith("*")]
+
+
+_LANGS_WITH_EXACT_MARKERS = [lang for lang in _LANGUAGE_MARKERS if _exact_markers(lang)]
+_LANGS_WITH_GLOB_MARKERS = [lang for lang in _LANGUAGE_MARKERS if _glob_markers(lang)]
+
+
 class TestDetectLanguages:
     """Parametrized tests covering every entry in _LANGUAGE_MARKERS."""
 
-    @pytest.mark.parametrize(("lang", "markers"), _LANGUAGE_MARKERS.items())
-    def test_exact_filename_marker_detected(
-        self, lang: str, markers: list[str], tmp_path
-    ):
+    @pytest.mark.parametrize("lang", _LANGS_WITH_EXACT_MARKERS)
+    def test_exact_filename_marker_detected(self, fresh_dir, lang: str):
         """Creating any non-glob marker file must detect that language."""
-        exact_markers = [m for m in markers if not m.startswith("*")]
-        if not exact_markers:
-            pytest.skip(f"{lang} has no exact filename markers")
-
-        marker = exact_markers[0]
-        (tmp_path / marker).write_text("", encoding="utf-8")
-        languages, _primary = _detect_languages(str(tmp_path))
+        (fresh_dir / _exact_markers(lang)[0]).touch()
+        languages, _primary = _detect_languages(str(fresh_dir))
 
         assert lang in languages
 
-    @pytest.mark.parametrize(("lang", "markers"), _LANGUAGE_MARKERS.items())
-    def test_glob_extension_marker_detected(
-        self, lang: str, markers: list[str], tmp_path
-    ):
+    @pytest.mark.parametrize("lang", _LANGS_WITH_GLOB_MARKERS)
+    def test_glob_extension_marker_detected(self, fresh_dir, lang: str):
         """Creating a file with a glob-matched extension must detect that language."""
-        glob_markers = [m for m in markers if m.startswith("*")]
-        if not glob_markers:
-            pytest.skip(f"{lang} has no glob extension markers")
-
-        ext = glob_markers[0][1:]  # strip leading '*'
-        (tmp_path / f"example{ext}").write_text("", encoding="utf-8")
-        languages, _primary = _detect_languages(str(tmp_path))
+        ext = _glob_markers(lang)[0][1:]  # strip leading '*'
+        (fresh_dir / f"example{ext}").touch()
+        languages, _primary = _detect_languages(str(fresh_dir))
 
         assert lang in languages
 
-    def test_empty_dir_detects_no_languages(self, tmp_path):
-        languages, primary = _detect_languages(str(tmp_path))
+    def test_empty_dir_detects_no_languages(self, fresh_dir):
+        languages, primary = _detect_languages(str(fresh_dir))
         assert languages == []
         assert primary == ""
 
-    def test_typescript_removes_javascript_when_both_present(self, tmp_path):
+    def test_typescript_removes_javascript_when_both_present(self, fresh_dir):
         """When tsconfig.json and package.json coexist, JS should be dropped."""
-        (tmp_path / "tsconfig.json").write_text("", encoding="utf-8")
-        (tmp_path / "package.json").write_text("{}", encoding="utf-8")
-        languages, _ = _detect_languages(str(tmp_path))
+        (fresh_dir / "tsconfig.json").touch()
+        (fresh_dir / "package.json").write_text("{}", encoding="utf-8")
+        languages, _ = _detect_languages(str(fresh_dir))
 
         assert "typescript" in languages
         assert "javascript" not in languages
 
-    def test_primary_language_priority_python_over_javascript(self, tmp_path):
-        (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
-        (tmp_path / "package.json").write_text("{}", encoding="utf-8")
-        _, primary = _detect_languages(str(tmp_path))
+    def test_primary_language_priority_python_over_javascript(self, fresh_dir):
+        (fresh_dir / "pyproject.toml").touch()
+        (fresh_dir / "package.json").write_text("{}", encoding="utf-8")
+        _, primary = _detect_languages(str(fresh_dir))
 
         assert primary == "python"
 
-    def test_primary_language_priority_python_over_rust(self, tmp_path):
-        (tmp_path / "pyproject.toml").write_text("", encoding="utf-8")
-        (tmp_path / "Cargo.toml").write_text("", encoding="utf-8")
-        _, primary = _detect_languages(str(tmp_path))
+    def test_primary_language_priority_python_over_rust(self, fresh_dir):
+        (fresh_dir / "pyproject.toml").touch()
+        (fresh_dir / "Cargo.toml").touch()
+        _, primary = _detect_languages(str(fresh_dir))
 
         assert primary == "python"
 
-    def test_primary_language_fallback_to_first(self, tmp_path):
+    def test_primary_language_fallback_to_first(self, fresh_dir):
         """A language not in the priority list gets primary set to itself."""
-        (tmp_path / "mix.exs").write_text("", encoding="utf-8")
-        languages, primary = _detect_languages(str(tmp_path))
+        (fresh_dir / "mix.exs").touch()
+        languages, primary = _detect_languages(str(fresh_dir))
 
         assert "elixir" in languages
         assert primary == "elixir"
@@ -106,21 +117,23 @@ class TestDetectPackageManager:
     """Parametrized tests covering every entry in _LOCK_FILE_MANAGERS."""
 
     @pytest.mark.parametrize(
-        ("lock_file", "expected_manager"), _LOCK_FILE_MANAGERS.items()
+        ("lock_file", "expected_manager"),
+        _LOCK_FILE_MANAGERS.items(),
+        ids=list(_LOCK_FILE_MANAGERS),
     )
     def test_lock_file_returns_correct_manager(
-        self, lock_file: str, expected_manager: str, tmp_path
+        self, lock_file: str, expected_manager: str, memory_project
     ):
-        (tmp_path / lock_file).write_text("", encoding="utf-8")
-        result = _detect_package_manager(str(tmp_path), languages=[])
+        memory_project[lock_file] = ""
+        result = _detect_package_manager(memory_project.root, languages=[])
         assert result == expected_manager
 
-    def test_no_lock_file_returns_none(self, tmp_path):
-        result = _detect_package_manager(str(tmp_path), languages=[])
+    def test_no_lock_file_returns_none(self, fresh_dir):
+        result = _detect_package_manager(str(fresh_dir), languages=[])
         assert result == "none"
 
-    def test_empty_dir_returns_none(self, tmp_path):
-        result = _detect_package_manager(str(tmp_path), languages=[])
+    def test_empty_dir_returns_none(self, fresh_dir):
+        result = _detect_package_manager(str(fresh_dir), languages=[])
         assert result == "none"
 
 
@@ -129,46 +142,66 @@ class TestDetectPackageManager:
 # ---------------------------------------------------------------------------
 
 
-def _tool_markers_by_kind(tool: str) -> tuple[list[str], list[str]]:
+def _tool_markers_by_kind(tool: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
     """Split a tool's markers into TOML-section markers and file markers."""
     markers = _TOOL_MARKERS[tool]
-    toml = [m for m in markers if m.startswith("[")]
-    files = [m for m in markers if not m.startswith("[")]
+    toml = tuple(m for m in markers if m.startswith("["))
+    files = tuple(m for m in markers if not m.startswith("["))
     return toml, files
 
 
+# (tool, its TOML-section markers) and (tool, its first standalone marker file)
+_TOML_CASES = [
+    (tool, toml)
+    for tool in _TOOL_MARKERS
+    if (toml := _tool_markers_by_kind(tool)[0])
+]
+_FILE_CASES = [
+    (tool, files[0])
+    for tool in _TOOL_MARKERS
+    if (files := _tool_markers_by_kind(tool)[1])
+]
+
+
 class TestDetectExistingTools:
     """Parametrized tests covering every entry in _TOOL_MARKERS."""
 
     @pytest.mark.parametrize(
-        "tool", [t for t in _TOOL_MARKERS if _tool_markers_by_kind(t)[0]]
+        ("tool", "toml_markers"), _TOML_CASES, ids=[t for t, _ in _TOML_CASES]
     )
-    def test_toml_section_marker_detected(self, tool: str, tmp_path):
-        toml_markers, _ = _tool_markers_by_kind(tool)
+    def test_toml_section_marker_detected(
+        self, tool: str, toml_markers: tuple[str, ...], fresh_dir
+    ):
         content = "\n".join(toml_markers)
-        (tmp_path / "pyproject.toml").write_text(content, encoding="utf-8")
-        found = _detect_existing_tools(str(tmp_path))
+        (fresh_dir / "pyproject.toml").write_text(content, encoding="utf-8")
+        found = _detect_existing_tools(str(fresh_dir))
+
         assert tool in found
 
     @pytest.mark.parametrize(
-        "tool", [t for t in _TOOL_MARKERS if _tool_markers_by_kind(t)[1]]
+        ("tool", "marker"), _FILE_CASES, ids=[t for t, _ in _FILE_CASES]
     )
-    def test_standalone_file_marker_detected(self, tool: str, tmp_path):
-        _, file_markers = _tool_markers_by_kind(tool)
-        (tmp_path / file_markers[0]).write_text("", encoding="utf-8")
-        found = _detect_existing_tools(str(tmp_path))
+    def test_standalone_file_marker_detected(self, tool: str, marker: str, fresh_dir):
+        (fresh_dir / marker).touch()
+        found = _detect_existing_tools(str(fresh_dir))
+
         assert tool in found
 
-    def test_empty_dir_detects_no_tools(self, tmp_path):
-        found = _detect_existing_tools(str(tmp_path))
+    def test_empty_dir_detects_no_tools(self, fresh_dir):
+        found = _detect_existing_tools(str(fresh_dir))
         assert found == []
 
-    def test_jest_detected_via_package_json_marker(self, tmp_path):
+    def test_undecodable_bytes_in_pyproject_ignored(self, fresh_dir):
+        (fresh_dir / "pyproject.toml").write_bytes(b"# \xff\xfe\r\n[tool.ruff]\r\n")
+        found = _detect_existing_tools(str(fresh_dir))
+        assert found == ["ruff"]
+
+    def test_jest_detected_via_package_json_marker(self, fresh_dir):
         """jest.config.js in package.json content also triggers detection."""
-        (tmp_path / "package.json").write_text(
+        (fresh_dir / "package.json").write_text(
             '{"scripts": {"test": "jest.config.js"}}'
         )
-        found = _detect_existing_tools(str(tmp_path))
+        found = _detect_existing_tools(str(fresh_dir))
         assert "jest" in found
 
 
@@ -177,86 +210,101 @@ class TestDetectExistingTools:
 # ---------------------------------------------------------------------------
 
 
-# Frameworks whose name is a substring of another framework's name cause the
-# engine's simple `in` check to match the shorter name first, making exact
-# stack assertions fragile.  Those cases are tested separately below.
-# "react" is a substring of "react-native"; both must be excluded from the
-# parametrized exact-stack test and covered by dedicated tests below.
-_AMBIGUOUS_FRAMEWORKS = {"react", "react-native"}
+def _package_json(dependencies: dict[str, str]) -> str:
+    """Serialize a package.json manifest declaring the given dependencies."""
+    return json.dumps({"dependencies": dependencies})
 
 
 class TestDetectFrameworksAndStack:
-    """Parametrized tests covering every entry in _FRAMEWORK_PATTERNS."""
+    """Parametrized tests covering every entry in _FRAMEWORK_PATTERNS.
+
+    Manifest content is passed in directly; test_manifests_read_from_disk
+    covers reading the dependency files.
+    """
 
     @pytest.mark.parametrize(
         ("framework", "lang_stack"),
-        [
-            (f, ls)
-            for f, ls in _FRAMEWORK_PATTERNS.items()
-            if f not in _AMBIGUOUS_FRAMEWORKS
-        ],
+        _FRAMEWORK_PATTERNS.items(),
+        ids=list(_FRAMEWORK_PATTERNS),
     )
     def test_framework_detected_and_stack_correct(
-        self, framework: str, lang_stack: tuple[str, str], tmp_path
+        self, framework: str, lang_stack: tuple[str, str]
     ):
         lang, expected_stack = lang_stack
-        (tmp_path / "pyproject.toml").write_text(
-            f'[project]\ndependencies = ["{framework}"]', encoding="utf-8"
-        )
-        lang_marker = next(m for m in _LANGUAGE_MARKERS[lang] if not m.startswith("*"))
-        if lang_marker != "pyproject.toml":
-            (tmp_path / lang_marker).write_text("", encoding="utf-8")
-
         frameworks, stack = _detect_frameworks_and_stack(
-            str(tmp_path), languages=[lang]
+            "", languages=[lang], content=_package_json({framework: "1.0"})
         )
 
         assert framework in frameworks
         assert stack == expected_stack
 
-    def test_react_native_detected(self, tmp_path):
-        """react-native is detected even though 'react' also matches as substring."""
-        (tmp_path / "package.json").write_text(
-            '{"dependencies": {"react-native": "0.73"}}', encoding="utf-8"
+    def test_react_native_not_reported_as_react(self):
+        """'react' is a prefix of 'react-native' but must not match inside it."""
+        frameworks, stack = _detect_frameworks_and_stack(
+            "",
+            languages=["typescript"],
+            content=_package_json({"react-native": "0.73"}),
+        )
+        assert frameworks == ["react-native"]
+        assert stack == "ts-mobile"
+
+    def test_react_and_react_native_both_detected(self):
+        frameworks, _ = _detect_frameworks_and_stack(
+            "",
+            languages=["typescript"],
+            content=_package_json({"react": "18.2", "react-native": "0.73"}),
         )
+        assert frameworks == ["react", "react-native"]
+
+    def test_framework_name_inside_longer_word_ignored(self):
         frameworks, _ = _detect_frameworks_and_stack(
-            str(tmp_path), languages=["typescript"]
+            "", languages=["typescript"], content=_package_json({"vuex": "4.0"})
         )
-        assert "react-native" in frameworks
+        assert frameworks == []
 
-    def test_first_framework_wins_stack(self, tmp_path):
+    def test_first_framework_wins_stack(self):
         """Stack should be set by the first matched framework."""
-        (tmp_path / "pyproject.toml").write_text(
-            '[project]\ndependencies = ["fastapi", "flask"]', encoding="utf-8"
+        _, stack = _detect_frameworks_and_stack(
+            "",
+            languages=["python"],
+            content='[project]\ndependencies = ["fastapi", "flask"]',
         )
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=["python"])
         assert stack == "python-backend"
 
-    def test_fallback_stack_python(self, tmp_path):
+    def test_framework_for_absent_language_ignored(self):
         frameworks, stack = _detect_frameworks_and_stack(
-            str(tmp_path), languages=["python"]
+            "", languages=["python"], content=_package_json({"express": "4.0"})
         )
         assert frameworks == []
         assert stack == "python-library"
 
-    def test_fallback_stack_typescript(self, tmp_path):
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=["typescript"])
-        assert stack == "ts-library"
-
-    def test_fallback_stack_javascript(self, tmp_path):
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=["javascript"])
-        assert stack == "js-library"
-
-    def test_fallback_stack_rust(self, tmp_path):
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=["rust"])
-        assert stack == "rust-library"
+    def test_manifests_read_from_disk(self, fresh_dir):
+        (fresh_dir / "requirements.txt").write_text("django==5.0\n", encoding="utf-8")
+        frameworks, stack = _detect_frameworks_and_stack(
+            str(fresh_dir), languages=["python"]
+        )
+        assert frameworks == ["django"]
+        assert stack == "python-backend"
 
-    def test_fallback_stack_go(self, tmp_path):
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=["go"])
-        assert stack == "go-service"
+    @pytest.mark.parametrize(
+        ("language", "expected_stack"),
+        [
+            ("python", "python-library"),
+            ("typescript", "ts-library"),
+            ("javascript", "js-library"),
+            ("rust", "rust-library"),
+            ("go", "go-service"),
+        ],
+    )
+    def test_fallback_stack(self, language: str, expected_stack: str):
+        frameworks, stack = _detect_frameworks_and_stack(
+            "", languages=[language], content=""
+        )
+        assert frameworks == []
+        assert stack == expected_stack
 
-    def test_no_language_no_stack(self, tmp_path):
-        _, stack = _detect_frameworks_and_stack(str(tmp_path), languages=[])
+    def test_no_language_no_stack(self):
+        _, stack = _detect_frameworks_and_stack("", languages=[], content="")
         assert stack == ""
 
 
@@ -266,32 +314,52 @@ class TestDetectFrameworksAndStack:
 
 
 class TestDetectDatabases:
-    """Parametrized tests covering every entry in _DATABASE_PATTERNS."""
+    """Table-driven tests covering every entry in _DATABASE_PATTERNS.
 
-    @pytest.mark.parametrize("db", _DATABASE_PATTERNS)
-    def test_db_detected_from_pyproject(self, db: str, tmp_path):
-        (tmp_path / "pyproject.toml").write_text(
-            f'[project]\ndependencies = ["{db}"]', encoding="utf-8"
-        )
-        result = _detect_databases(str(tmp_path), languages=[])
-        assert db in result
+    Pattern matching is exercised against in-memory manifest content; the
+    per-source tests below cover reading each dependency file from disk.
+    """
 
-    @pytest.mark.parametrize("db", _DATABASE_PATTERNS)
-    def test_db_detected_from_requirements_txt(self, db: str, tmp_path):
-        (tmp_path / "requirements.txt").write_text(f"{db}==1.0.0\n", encoding="utf-8")
-        result = _detect_databases(str(tmp_path), languages=[])
+    @pytest.mark.parametrize("db", _DATABASE_PATTERNS, ids=list(_DATABASE_PATTERNS))
+    @pytest.mark.parametrize(
+        "template",
+        [
+            '[project]\ndependencies = ["{db}"]',
+            "{db}==1.0.0\n",
+            '{{"dependencies": {{"{db}": "1.0.0"}}}}',
+        ],
+        ids=["pyproject", "requirements_txt", "package_json"],
+    )
+    def test_db_detected_from_manifest_content(self, template: str, db: str):
+        content = template.format(db=db)
+        result = _detect_databases("", languages=[], content=content)
         assert db in result
 
-    @pytest.mark.parametrize("db", _DATABASE_PATTERNS)
-    def test_db_detected_from_package_json(self, db: str, tmp_path):
-        (tmp_path / "package.json").write_text(
-            f'{{"dependencies": {{"{db}": "1.0.0"}}}}', encoding="utf-8"
+    def test_pyproject_file_is_read(self, fresh_dir):
+        (fresh_dir / "pyproject.toml").write_text(
+            '[project]\ndependencies = ["sqlalchemy"]', encoding="utf-8"
         )
-        result = _detect_databases(str(tmp_path), languages=[])
-        assert db in result
+        result = _detect_databases(str(fresh_dir), languages=[])
+        assert "sqlalchemy" in result
+
+    def test_requirements_txt_file_is_read(self, fresh_dir):
+        (fresh_dir / "requirements.txt").write_text("redis==5.0.0\n", encoding="utf-8")
+        result = _detect_databases(str(fresh_dir), languages=[])
+        assert "redis" in result
+
+    def test_package_json_file_is_read(self, fresh_dir):
+        (fresh_dir / "package.json").write_text(
+            '{"dependencies": {"prisma": "5.0.0"}}', encoding="utf-8"
+        )
+        result = _detect_databases(str(fresh_dir), languages=[])
+        assert "prisma" in result
+
+    def test_empty_dir_detects_no_databases(self, fresh_dir):
+        result = _detect_databases(str(fresh_dir), languages=[])
+        assert result == []
 
-    def test_empty_dir_detects_no_databases(self, tmp_path):
-        result = _detect_databases(str(tmp_path), languages=[])
+    def test_empty_content_detects_no_databases(self):
+        result = _detect_databases("", languages=[], content="")
         assert result == []
 
 
@@ -300,11 +368,33 @@ class TestDetectDatabases:
 # ---------------------------------------------------------------------------
 
 
+# (path to create, create as directory, flags that must then be set)
+_INFRA_CASES = [
+    pytest.param(".git", True, ("git",), id="git"),
+    pytest.param(".gitignore", False, ("gitignore",), id="gitignore"),
+    pytest.param("Dockerfile", False, ("dockerfile",), id="dockerfile"),
+    pytest.param(
+        "docker-compose.yml", False, ("docker_compose",), id="docker_compose_yml"
+    ),
+    pytest.param(
+        "docker-compose.yaml", False, ("docker_compose",), id="docker_compose_yaml"
+    ),
+    pytest.param(".github", True, ("github_dir",), id="github_dir"),
+    pytest.param(
+        ".github/workflows",
+        True,
+        ("github_actions", "github_dir"),
+        id="github_actions",
+    ),
+    pytest.param(".gitlab-ci.yml", False, ("gitlab_ci",), id="gitlab_ci"),
+]
+
+
 class TestDetectInfrastructure:
     """Each Infrastructure flag toggled on and verified."""
 
-    def test_empty_dir_all_flags_false(self, tmp_path):
-        infra = _detect_infrastructure(str(tmp_path))
+    def test_empty_dir_all_flags_false(self, fresh_dir):
+        infra = _detect_infrastructure(str(fresh_dir))
         assert not infra.git
         assert not infra.gitignore
         assert not infra.dockerfile
@@ -313,47 +403,21 @@ class TestDetectInfrastructure:
         assert not infra.github_dir
         assert not infra.gitlab_ci
 
-    def test_git_flag(self, tmp_path):
-        (tmp_path / ".git").mkdir()
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.git
-
-    def test_gitignore_flag(self, tmp_path):
-        (tmp_path / ".gitignore").write_text("", encoding="utf-8")
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.gitignore
-
-    def test_dockerfile_flag(self, tmp_path):
-        (tmp_path / "Dockerfile").write_text("", encoding="utf-8")
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.dockerfile
-
-    def test_docker_compose_yml_flag(self, tmp_path):
-        (tmp_path / "docker-compose.yml").write_text("", encoding="utf-8")
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.docker_compose
-
-    def test_docker_compose_yaml_flag(self, tmp_path):
-        (tmp_path / "docker-compose.yaml").write_text("", encoding="utf-8")
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.docker_compose
-
-    def test_github_dir_flag(self, tmp_path):
-        (tmp_path / ".github").mkdir()
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.github_dir
-
-    def test_github_actions_flag(self, tmp_path):
-        workflows = tmp_path / ".github" / "workflows"
-        workflows.mkdir(parents=True)
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.github_actions
-        assert infra.github_dir
-
-    def test_gitlab_ci_flag(self, tmp_path):
-        (tmp_path / ".gitlab-ci.yml").write_text("", encoding="utf-8")
-        infra = _detect_infrastructure(str(tmp_path))
-        assert infra.gitlab_ci
+    def test_github_file_is_not_github_dir(self, fresh_dir):
+        (fresh_dir / ".github").touch()
+        infra = _detect_infrastructure(str(fresh_dir))
+        assert not infra.github_dir
+        assert not infra.github_actions
+
+    @pytest.mark.parametrize(("path", "is_dir", "flags"), _INFRA_CASES)
+    def test_flag(self, path: str, is_dir: bool, flags: tuple[str, ...], fresh_dir):
+        if is_dir:
+            (fresh_dir / path).mkdir(parents=True)
+        else:
+            (fresh_dir / path).touch()
+        infra = _detect_infrastructure(str(fresh_dir))
+        for flag in flags:
+            assert getattr(infra, flag), flag
 
 
 # ---------------------------------------------------------------------------
@@ -365,39 +429,38 @@ class TestDetectStructure:
     """Tests covering monorepo, fullstack, and single structure detection."""
 
     @pytest.mark.parametrize(
-        ("marker", "expected_manager"), _WORKSPACE_MANAGERS.items()
+        ("marker", "expected_manager"),
+        _WORKSPACE_MANAGERS.items(),
+        ids=list(_WORKSPACE_MANAGERS),
     )
     def test_workspace_marker_returns_monorepo(
-        self, marker: str, expected_manager: str, tmp_path
+        self, marker: str, expected_manager: str, memory_project
     ):
-        (tmp_path / marker).write_text("", encoding="utf-8")
-        structure, manager = _detect_structure(str(tmp_path))
+        memory_project[marker] = ""
+        structure, manager = _detect_structure(memory_project.root)
         assert structure == "monorepo"
         assert manager == expected_manager
 
-    def test_two_fullstack_dirs_returns_fullstack(self, tmp_path):
+    def test_two_fullstack_dirs_returns_fullstack(self, fresh_dir):
         # Use the first two entries from _FULLSTACK_DIRS
-        d1, d2 = _FULLSTACK_DIRS[0], _FULLSTACK_DIRS[1]
-        (tmp_path / d1).mkdir()
-        (tmp_path / d2).mkdir()
-        structure, manager = _detect_structure(str(tmp_path))
+        _make_dirs(fresh_dir, _FULLSTACK_DIRS[:2])
+        structure, manager = _detect_structure(str(fresh_dir))
         assert structure == "fullstack"
         assert manager == "none"
 
-    def test_one_fullstack_dir_returns_single(self, tmp_path):
-        (tmp_path / _FULLSTACK_DIRS[0]).mkdir()
-        structure, _ = _detect_structure(str(tmp_path))
+    def test_one_fullstack_dir_returns_single(self, fresh_dir):
+        (fresh_dir / _FULLSTACK_DIRS[0]).mkdir()
+        structure, _ = _detect_structure(str(fresh_dir))
         assert structure == "single"
 
-    def test_empty_dir_returns_single(self, tmp_path):
-        structure, manager = _detect_structure(str(tmp_path))
+    def test_empty_dir_returns_single(self, fresh_dir):
+        structure, manager = _detect_structure(str(fresh_dir))
         assert structure == "single"
         assert manager == "none"
 
-    def test_all_fullstack_dirs_returns_fullstack(self, tmp_path):
-        for d in _FULLSTACK_DIRS:
-            (tmp_path / d).mkdir()
-        structure, _ = _detect_structure(str(tmp_path))
+    def test_all_fullstack_dirs_returns_fullstack(self, fresh_dir):
+        _make_dirs(fresh_dir, _FULLSTACK_DIRS)
+        structure, _ = _detect_structure(str(fresh_dir))
         assert structure == "fullstack"
 
 
@@ -409,8 +472,8 @@ class TestDetectStructure:
 class TestDetectProject:
     """Integration-level tests for the public detect_project function."""
 
-    def test_empty_dir_returns_default_detection(self, tmp_path):
-        result = detect_project(str(tmp_path))
+    def test_empty_dir_returns_default_detection(self, fresh_dir):
+        result = detect_project(str(fresh_dir))
         assert result.languages == []
         assert result.primary_language == ""
         assert result.package_manager == "none"
@@ -421,28 +484,75 @@ class TestDetectProject:
         assert result.structure_type == "single"
         assert result.workspace_manager == "none"
 
-    def test_nonexistent_path_returns_default_detection(self, tmp_path):
-        result = detect_project(str(tmp_path / "does_not_exist"))
+    def test_nonexistent_path_returns_default_detection(self, fresh_dir):
+        result = detect_project(str(fresh_dir / "does_not_exist"))
         assert result.languages == []
         assert result.primary_language == ""
         assert result.package_manager == "none"
 
-    def test_python_project_detected(self, tmp_path):
-        (tmp_path / "pyproject.toml").write_text(
+    def test_python_project_detected(self, fresh_dir):
+        (fresh_dir / "pyproject.toml").write_text(
             '[project]\nname = "myapp"\n[tool.pytest.ini_options]\n', encoding="utf-8"
         )
-        (tmp_path / "uv.lock").write_text("", encoding="utf-8")
-        result = detect_project(str(tmp_path))
+        (fresh_dir / "uv.lock").touch()
+        result = detect_project(str(fresh_dir))
         assert "python" in result.languages
         assert result.primary_language == "python"
         assert result.package_manager == "uv"
         assert "pytest" in result.existing_tools
 
-    def test_system_tools_always_populated(self, tmp_path):
-        result = detect_project(str(tmp_path))
+    def test_python_project_detected_in_memory(self, memory_project):
+        memory_project["pyproject.toml"] = (
+            '[project]\ndependencies = ["fastapi"]\n[tool.ruff]\n'
+        )
+        memory_project["uv.lock"] = ""
+        memory_project[".github/workflows/ci.yml"] = ""
+        result = detect_project(memory_project.root)
+        assert result.primary_language == "python"
+        assert result.package_manager == "uv"
+        assert "ruff" in result.existing_tools
+        assert result.frameworks == ["fastapi"]
+        assert result.infrastructure.github_actions
+
+    def test_project_root_listed_once(self, fresh_dir, monkeypatch):
+        (fresh_dir / "pyproject.toml").touch()
+        (fresh_dir / "frontend").mkdir()
+        calls: list[str] = []
+        real_list_entries = detection._list_entries
+
+        def counting_list_entries(path: str) -> set[str]:
+            calls.append(path)
+            return real_list_entries(path)
+
+        monkeypatch.setattr(detection, "_list_entries", counting_list_entries)
+        detect_project(str(fresh_dir))
+        assert calls == [str(fresh_dir)]
+
+    def test_dependency_manifests_read_once(self, fresh_dir, monkeypatch):
+        (fresh_dir / "pyproject.toml").write_text(
+            '[project]\ndependencies = ["fastapi", "redis"]\n[tool.ruff]\n',
+            encoding="utf-8",
+        )
+        (fresh_dir / "package.json").write_text("{}", encoding="utf-8")
+        reads: list[str] = []
+        real_read_file_safe = detection._read_file_safe
+
+        def counting_read_file_safe(path: str) -> str:
+            reads.append(os.path.basename(path))
+            return real_read_file_safe(path)
+
+        monkeypatch.setattr(detection, "_read_file_safe", counting_read_file_safe)
+        result = detect_project(str(fresh_dir))
+        assert sorted(reads) == ["package.json", "pyproject.toml"]
+        assert result.existing_tools == ["ruff"]
+        assert result.frameworks == ["fastapi"]
+        assert result.databases == ["redis"]
+
+    def test_system_tools_always_populated(self, fresh_dir):
+        result = detect_project(str(fresh_dir))
         # SystemTools is always populated (may be 'not found' but not None)
         assert result.system_tools is not None
 
-    def test_returns_project_detection_type(self, tmp_path):
-        result = detect_project(str(tmp_path))
+    def test_returns_project_detection_type(self, fresh_dir):
+        result = detect_project(str(fresh_dir))
         assert isinstance(result, ProjectDetection)
@@ -9,7 +9,8 @@ Covers the three drift sub-types from plan/05-ATLAS-API.md §27 Type 3:
 from __future__ import annotations
 
 import json
-import os
+
+import pytest
 
 from atlas.core.drift import (
     apply_drift_updates,
@@ -19,30 +20,25 @@ from atlas.core.drift import (
 )
 
 
+# pyproject.toml bodies reused across tests.
+_PYPROJECT_MYPY = "[tool.mypy]\nstrict = true\n"
+_PYPROJECT_RUFF_88 = "[tool.ruff]\nline-length = 88\n"
+_PYPROJECT_RUFF_100 = "[tool.ruff]\nline-length = 100\n"
+
+
 # ---------------------------------------------------------------------------
 # Shared helpers
 # ---------------------------------------------------------------------------
 
 
-def _write_snapshot(atlas_dir, module_name: str, data: dict) -> None:
+def _write_snapshot(modules_dir, module_name: str, data: dict) -> None:
     """Write a module snapshot JSON to .atlas/modules/<name>.json."""
-    mods_dir = os.path.join(str(atlas_dir), "modules")
-    os.makedirs(mods_dir, exist_ok=True)
-    with open(os.path.join(mods_dir, f"{module_name}.json"), "w") as f:
-        json.dump(data, f)
+    (modules_dir / f"{module_name}.json").write_text(json.dumps(data, separators=(",", ":")))
 
 
-def _read_snapshot(atlas_dir, module_name: str) -> dict:
+def _read_snapshot(modules_dir, module_name: str) -> dict:
     """Read a module snapshot JSON from .atlas/modules/<name>.json."""
-    path = os.path.join(str(atlas_dir), "modules", f"{module_name}.json")
-    with open(path) as f:
-        return json.load(f)
-
-
-def _write_project_file(project_dir, filename: str, content: str) -> None:
-    """Write a file into the project directory."""
-    with open(os.path.join(str(project_dir), filename), "w") as f:
-        f.write(content)
+    return json.loads((modules_dir / f"{module_name}.json").read_text())
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +46,35 @@ def _write_project_file(project_dir, filename: str, content: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _ruff_120_to_100(root, make_atlas_layout):
+    """Snapshot line-length 120, config line-length 100, drift detected once."""
+    atlas_dir, modules_dir, project_dir = make_atlas_layout(root)
+    _write_snapshot(
+        modules_dir, "ruff",
+        {"id": "ruff", "name": "Ruff Linter", "version": "1.0.0",
+         "style": {"line_length": "120"}}
+    )
+    (project_dir / "pyproject.toml").write_text(_PYPROJECT_RUFF_100)
+    result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
+    return atlas_dir, modules_dir, project_dir, result
+
+
+@pytest.fixture(scope="module")
+def ruff_120_to_100(tmp_path_factory, make_atlas_layout):
+    """``(atlas_dir, modules_dir, project_dir, result)`` for the 120 → 100 drift."""
+    return _ruff_120_to_100(tmp_path_factory.mktemp("ruff_120_to_100"), make_atlas_layout)
+
+
+@pytest.fixture(scope="module")
+def ruff_120_to_100_applied(tmp_path_factory, make_atlas_layout):
+    """Apply the 120 → 100 drift on its own layout; return (updated, snapshot)."""
+    root = tmp_path_factory.mktemp("ruff_120_to_100_applied")
+    atlas_dir, modules_dir, project_dir, result = _ruff_120_to_100(root, make_atlas_layout)
+    updated = apply_drift_updates(result["drifted"], str(atlas_dir), str(project_dir))
+    return updated, _read_snapshot(modules_dir, "ruff")
+
+
+@pytest.mark.xdist_group(name="drift-scenario-config-changed")
 class TestDriftScenarioConfigChanged:
     """Scenario: user edits a config file after atlas init.
 
@@ -57,29 +82,16 @@ class TestDriftScenarioConfigChanged:
     write the new value back to the snapshot on disk.
     """
 
-    def _setup(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
-        (atlas_dir / "modules").mkdir(parents=True)
-        project_dir = tmp_path / "project"
-        project_dir.mkdir()
-        return atlas_dir, project_dir
-
-    def test_changed_value_in_drifted(self, tmp_path):
+    def test_changed_value_in_drifted(self, ruff_120_to_100):
         """A changed config value appears in the drifted list."""
-        atlas_dir, project_dir = self._setup(tmp_path)
-        _write_snapshot(atlas_dir, "ruff", {"style": {"line_length": "120"}})
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 100\n")
-        result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
+        *_, result = ruff_120_to_100
         drifted_modules = [d["module"] for d in result["drifted"]]
         assert "ruff" in drifted_modules
         assert "ruff" not in result["unchanged"]
 
-    def test_changed_value_has_correct_old_and_new(self, tmp_path):
+    def test_changed_value_has_correct_old_and_new(self, ruff_120_to_100):
         """The change entry records both the old and new value."""
-        atlas_dir, project_dir = self._setup(tmp_path)
-        _write_snapshot(atlas_dir, "ruff", {"style": {"line_length": "120"}})
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 100\n")
-        result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
+        *_, result = ruff_120_to_100
         ruff_entry = next(d for d in result["drifted"] if d["module"] == "ruff")
         ll_change = next(
             (c for c in ruff_entry["changes"] if "line_length" in c["key"]), None
@@ -88,29 +100,29 @@ class TestDriftScenarioConfigChanged:
         assert ll_change["old"] == "120"
         assert ll_change["new"] == "100"
 
-    def test_unchanged_module_in_unchanged_list(self, tmp_path):
+    def test_unchanged_module_in_unchanged_list(self, atlas_layout):
         """A module with no config file ends up in unchanged, not drifted."""
-        atlas_dir, project_dir = self._setup(tmp_path)
-        _write_snapshot(atlas_dir, "ruff", {"style": {"line_length": "120"}})
+        atlas_dir, modules_dir, project_dir = atlas_layout
+        _write_snapshot(modules_dir, "ruff", {"style": {"line_length": "120"}})
         # No pyproject.toml → scan_module_config returns found=False → unchanged
         result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
         assert "ruff" in result["unchanged"]
         drifted_modules = [d["module"] for d in result["drifted"]]
         assert "ruff" not in drifted_modules
 
-    def test_multiple_values_changed_all_reported(self, tmp_path):
+    def test_multiple_values_changed_all_reported(self, atlas_layout):
         """Two changed keys on a single module both appear in drifted[0]['changes']."""
-        atlas_dir, project_dir = self._setup(tmp_path)
+        atlas_dir, modules_dir, project_dir = atlas_layout
         # Snapshot has style.line_length=120 and extra_setting=old_value.
         # The scanner will never produce extra_setting, so it will appear as new=None.
         _write_snapshot(
-            atlas_dir, "ruff",
+            modules_dir, "ruff",
             {"style": {"line_length": "120"}, "extra_setting": "old_value"}
         )
         # Config file changes line_length to 100; extra_setting is a custom key not produced
         # by the scanner, so it will appear as new=None (removed from config perspective).
         # Also line_length changes from 120 to 100.
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 100\n")
+        (project_dir / "pyproject.toml").write_text(_PYPROJECT_RUFF_100)
         result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
         drifted_modules = [d["module"] for d in result["drifted"]]
         assert "ruff" in drifted_modules
@@ -121,13 +133,13 @@ class TestDriftScenarioConfigChanged:
         assert any("extra_setting" in k for k in change_keys)
         assert len(ruff_entry["changes"]) == 2
 
-    def test_value_removed_from_config_reported(self, tmp_path):
+    def test_value_removed_from_config_reported(self, atlas_layout):
         """A key in the snapshot but absent from the live config gets new=None."""
-        atlas_dir, project_dir = self._setup(tmp_path)
+        atlas_dir, modules_dir, project_dir = atlas_layout
         # Snapshot has a custom key 'extra_setting' the scanner will never produce
-        _write_snapshot(atlas_dir, "ruff", {"id": "ruff", "extra_setting": "foo"})
+        _write_snapshot(modules_dir, "ruff", {"id": "ruff", "extra_setting": "foo"})
         # Live config has ruff section so scan finds it, but produces only style.line_length
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 88\n")
+        (project_dir / "pyproject.toml").write_text(_PYPROJECT_RUFF_88)
         result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
         ruff_entry = next((d for d in result["drifted"] if d["module"] == "ruff"), None)
         assert ruff_entry is not None
@@ -138,13 +150,13 @@ class TestDriftScenarioConfigChanged:
         assert removed_change["old"] == "foo"
         assert removed_change["new"] is None
 
-    def test_new_value_in_config_reported(self, tmp_path):
+    def test_new_value_in_config_reported(self, atlas_layout):
         """A key present in the live config but absent from the snapshot gets old=None."""
-        atlas_dir, project_dir = self._setup(tmp_path)
+        atlas_dir, modules_dir, project_dir = atlas_layout
         # Snapshot has only meta keys — no data keys at all
-        _write_snapshot(atlas_dir, "ruff", {"id": "ruff"})
+        _write_snapshot(modules_dir, "ruff", {"id": "ruff"})
         # Live config introduces line-length which scanner extracts as style.line_length
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 88\n")
+        (project_dir / "pyproject.toml").write_text(_PYPROJECT_RUFF_88)
         result = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
         ruff_entry = next((d for d in result["drifted"] if d["module"] == "ruff"), None)
         assert ruff_entry is not None
@@ -155,33 +167,16 @@ class TestDriftScenarioConfigChanged:
         assert new_change["old"] is None
         assert new_change["new"] == "88"
 
-    def test_apply_writes_new_value_to_snapshot(self, tmp_path):
+    def test_apply_writes_new_value_to_snapshot(self, ruff_120_to_100_applied):
         """apply_drift_updates writes the updated config value back to disk."""
-        atlas_dir, project_dir = self._setup(tmp_path)
-        _write_snapshot(
-            atlas_dir, "ruff",
-            {"id": "ruff", "style": {"line_length": "120"}}
-        )
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 100\n")
-        drifted = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
-        updated = apply_drift_updates(drifted["drifted"], str(atlas_dir), str(project_dir))
+        updated, snap = ruff_120_to_100_applied
         assert "ruff" in updated
         # Verify the snapshot on disk now contains the new value (stored as int or str)
-        snap = _read_snapshot(atlas_dir, "ruff")
         assert str(snap.get("style", {}).get("line_length")) == "100"
 
-    def test_apply_preserves_meta_fields(self, tmp_path):
+    def test_apply_preserves_meta_fields(self, ruff_120_to_100_applied):
         """apply_drift_updates never overwrites id, name, version in the snapshot."""
-        atlas_dir, project_dir = self._setup(tmp_path)
-        _write_snapshot(
-            atlas_dir, "ruff",
-            {"id": "ruff", "name": "Ruff Linter", "version": "1.0.0",
-             "style": {"line_length": "120"}}
-        )
-        _write_project_file(project_dir, "pyproject.toml", "[tool.ruff]\nline-length = 100\n")
-        drifted = detect_value_drift({"ruff": {}}, str(atlas_dir), str(project_dir))
-        apply_drift_updates(drifted["drifted"], str(atlas_dir), str(project_dir))
-        snap = _read_snapshot(atlas_dir, "ruff")
+        _, snap = ruff_120_to_100_applied
         assert snap["id"] == "ruff"
         assert snap["name"] == "Ruff Linter"
         assert snap["version"] == "1.0.0"
@@ -198,55 +193,36 @@ class TestDriftScenarioNewTool:
     suggest 'atlas add <name>'.
     """
 
-    def _registry(self):
-        return {
-            "modules": {
-                "mypy": {
-                    "detect_files": [],
-                    "detect_in_config": {"pyproject.toml": "[tool.mypy]"},
-                },
-                "ruff": {
-                    "detect_files": ["ruff.toml"],
-                    "detect_in_config": {"pyproject.toml": "[tool.ruff]"},
-                },
-                "eslint": {
-                    "detect_files": [".eslintrc.json"],
-                    "detect_in_config": {},
-                },
-            }
-        }
-
-    def test_new_tool_via_detect_file_suggested(self, tmp_path):
+    def test_new_tool_via_detect_file_suggested(self, memory_project, tool_registry):
         """A tool whose sentinel file appears is suggested for install."""
-        (tmp_path / "ruff.toml").write_text("[tool.ruff]\n")
-        result = detect_new_tools(self._registry(), {}, str(tmp_path))
+        memory_project["ruff.toml"] = "[tool.ruff]\n"
+        result = detect_new_tools(tool_registry, {}, memory_project.root)
         assert "ruff" in result
 
-    def test_new_tool_via_config_section_suggested(self, tmp_path):
+    def test_new_tool_via_config_section_suggested(self, memory_project, tool_registry):
         """A tool whose config section appears in pyproject.toml is suggested."""
-        (tmp_path / "pyproject.toml").write_text("[tool.mypy]\nstrict = true\n")
-        result = detect_new_tools(self._registry(), {}, str(tmp_path))
+        memory_project["pyproject.toml"] = _PYPROJECT_MYPY
+        result = detect_new_tools(tool_registry, {}, memory_project.root)
         assert "mypy" in result
 
-    def test_multiple_new_tools_all_suggested_sorted(self, tmp_path):
+    def test_multiple_new_tools_all_suggested_sorted(self, memory_project, tool_registry):
         """Multiple new tool configs → all suggested, result is sorted."""
-        (tmp_path / "ruff.toml").write_text("")
-        (tmp_path / ".eslintrc.json").write_text("{}")
-        result = detect_new_tools(self._registry(), {}, str(tmp_path))
+        memory_project.update({"ruff.toml": "", ".eslintrc.json": "{}"})
+        result = detect_new_tools(tool_registry, {}, memory_project.root)
         assert "ruff" in result
         assert "eslint" in result
         assert result == sorted(result)
 
-    def test_already_installed_tool_not_suggested(self, tmp_path):
+    def test_already_installed_tool_not_suggested(self, memory_project, tool_registry):
         """A tool whose config is present but already installed is not suggested."""
-        (tmp_path / "ruff.toml").write_text("")
-        result = detect_new_tools(self._registry(), {"ruff": {}}, str(tmp_path))
+        memory_project["ruff.toml"] = ""
+        result = detect_new_tools(tool_registry, {"ruff": {}}, memory_project.root)
         assert "ruff" not in result
 
-    def test_tool_not_in_registry_not_suggested(self, tmp_path):
+    def test_tool_not_in_registry_not_suggested(self, memory_project, tool_registry):
         """A config file that doesn't match any registry module is ignored."""
-        (tmp_path / "unknown-tool.json").write_text("{}")
-        result = detect_new_tools(self._registry(), {}, str(tmp_path))
+        memory_project["unknown-tool.json"] = "{}"
+        result = detect_new_tools(tool_registry, {}, memory_project.root)
         assert result == []
 
 
@@ -262,54 +238,29 @@ class TestDriftScenarioRemovedTool:
     Atlas does NOT auto-remove — the user may have just moved the config.
     """
 
-    def _registry(self):
-        return {
-            "modules": {
-                "ruff": {
-                    "detect_files": ["ruff.toml"],
-                    "detect_in_config": {"pyproject.toml": "[tool.ruff]"},
-                },
-                "mypy": {
-                    "detect_files": [],
-                    "detect_in_config": {"pyproject.toml": "[tool.mypy]"},
-                },
-                "eslint": {
-                    "detect_files": [".eslintrc.json"],
-                    "detect_in_config": {},
-                },
-                "git": {
-                    "detect_files": [],
-                    "detect_in_config": {},
-                },
-            }
-        }
-
-    def test_config_file_deleted_flagged(self, tmp_path):
-        """Installed module whose sentinel file is gone is flagged."""
-        result = detect_removed_tools(self._registry(), {"ruff": {}}, str(tmp_path))
-        assert "ruff" in result
-
-    def test_config_section_absent_from_existing_pyproject_flagged(self, tmp_path):
-        """An installed module whose section is absent from an existing pyproject.toml is flagged."""
-        (tmp_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 88\n")
-        result = detect_removed_tools(self._registry(), {"mypy": {}}, str(tmp_path))
-        assert "mypy" in result
-
-    def test_config_moved_to_other_file_not_flagged(self, tmp_path):
-        """Module is not flagged if config moved to a file still matching detect_in_config."""
-        (tmp_path / "pyproject.toml").write_text("[tool.ruff]\nline-length = 88\n")
-        result = detect_removed_tools(self._registry(), {"ruff": {}}, str(tmp_path))
-        assert "ruff" not in result
-
-    def test_multiple_tools_gone_all_flagged_sorted(self, tmp_path):
-        """Multiple installed modules with missing configs are all flagged, sorted."""
-        installed = {"ruff": {}, "mypy": {}}
-        result = detect_removed_tools(self._registry(), installed, str(tmp_path))
-        assert "ruff" in result
-        assert "mypy" in result
-        assert result == sorted(result)
-
-    def test_tool_with_no_detection_criteria_never_flagged(self, tmp_path):
-        """A module with no detect_files and no detect_in_config is never flagged."""
-        result = detect_removed_tools(self._registry(), {"git": {}}, str(tmp_path))
-        assert "git" not in result
+    @pytest.mark.parametrize(
+        ("files", "installed", "expected"),
+        [
+            ({}, ["ruff"], ["ruff"]),
+            ({"pyproject.toml": _PYPROJECT_RUFF_88}, ["mypy"], ["mypy"]),
+            ({"pyproject.toml": _PYPROJECT_RUFF_88}, ["ruff"], []),
+            ({}, ["ruff", "mypy"], ["mypy", "ruff"]),
+            ({}, ["clippy"], []),
+        ],
+        ids=[
+            # sentinel file gone
+            "config-file-deleted",
+            # section absent from an existing pyproject.toml
+            "section-absent",
+            # config moved to a file still matching detect_in_config
+            "moved-still-detected",
+            # every missing config flagged, result sorted
+            "multiple-gone-sorted",
+            # no detect_files and no detect_in_config: never flagged
+            "no-detection-criteria",
+        ],
+    )
+    def test_removed_tools(self, memory_project, tool_registry, files, installed, expected):
+        memory_project.update(files)
+        installed_modules = {name: {} for name in installed}
+        assert detect_removed_tools(tool_registry, installed_modules, memory_project.root) == expected
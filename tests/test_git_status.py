@@ -3,138 +3,131 @@
 from __future__ import annotations
 
 import subprocess
-from unittest.mock import patch
 
 import pytest
 
-from atlas.runtime import Atlas
+from atlas import runtime
 
 
-def _make_atlas(tmp_path) -> Atlas:
-    (tmp_path / ".atlas").mkdir()
-    return Atlas(project_dir=str(tmp_path))
+_HASH = "0" * 40
 
 
-def _mock_git(responses: dict[str, str]):
-    """Return a mock for subprocess.check_output mapping git subcommands to outputs."""
-    def _check_output(cmd, **kwargs):
-        if cmd[1:3] == ["rev-list", "--left-right"]:
-            key = "rev-list"
-        elif cmd[1] == "diff" and "--cached" in cmd:
-            key = "diff-cached"
-        else:
-            key = cmd[1] if len(cmd) > 1 else ""
-        val = responses.get(key, "")
-        if val is None:
+def _porcelain(
+    branch: str,
+    ahead_behind: str | None = None,
+    unstaged: tuple[str, ...] = (),
+    staged: tuple[str, ...] = (),
+) -> bytes:
+    """Build ``git status --porcelain=v2 --branch -z`` output."""
+    records = ["# branch.oid " + _HASH, f"# branch.head {branch}"]
+    if ahead_behind is not None:
+        records += [f"# branch.upstream origin/{branch}", f"# branch.ab {ahead_behind}"]
+    for path in unstaged:
+        records.append(f"1 .M N... 100644 100644 100644 {_HASH} {_HASH} {path}")
+    for path in staged:
+        records.append(f"1 M. N... 100644 100644 100644 {_HASH} {_HASH} {path}")
+    return "".join(r + "\0" for r in records).encode()
+
+
+class _FakeGit:
+    """Stand-in for ``subprocess.check_output`` returning canned git output.
+
+    ``output = None`` makes the call fail as it does outside a repository.
+    """
+
+    def __init__(self) -> None:
+        self.output: bytes | None = b""
+        self.calls: list[tuple[str, ...]] = []
+
+    def __call__(self, cmd: tuple[str, ...], **kwargs) -> bytes:
+        self.calls.append(cmd)
+        if self.output is None:
             raise subprocess.CalledProcessError(128, cmd)
-        return val.encode()
-    return _check_output
+        return self.output
+
+
+@pytest.fixture(autouse=True)
+def fake_git(monkeypatch) -> _FakeGit:
+    fake = _FakeGit()
+    monkeypatch.setattr(runtime.subprocess, "check_output", fake)
+    return fake
 
 
 class TestQuickGitStatus:
-    def test_returns_empty_when_not_in_git_repo(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=subprocess.CalledProcessError(128, "git")):
-            result = atlas._quick_git_status()
+    def test_returns_empty_when_not_in_git_repo(self, atlas, fake_git):
+        fake_git.output = None
+        result = atlas._quick_git_status()
         assert result == ""
 
-    def test_returns_empty_when_branch_is_HEAD(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({"rev-parse": "HEAD"})):
-            result = atlas._quick_git_status()
+    def test_returns_empty_when_head_is_detached(self, atlas, fake_git):
+        fake_git.output = _porcelain("(detached)")
+        result = atlas._quick_git_status()
         assert result == ""
 
-    def test_branch_name_in_output(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "main",
-            "rev-list": "",
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "main" in result
-
-    def test_ahead_count_shown(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "feat/auth",
-            "rev-list": "2\t0",
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "2 ahead" in result
-
-    def test_behind_count_shown(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "feat/auth",
-            "rev-list": "0\t3",
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "3 behind" in result
-
-    def test_ahead_and_behind_shown(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "feat/auth",
-            "rev-list": "1\t2",
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "1 ahead" in result
-        assert "2 behind" in result
-
-    def test_unstaged_files_shown(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "main",
-            "rev-list": "0\t0",
-            "diff": "src/auth.py\nsrc/utils.py",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "Modified (unstaged)" in result
-        assert "src/auth.py" in result
-        assert "Staged" not in result
-
-    def test_staged_files_shown(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "main",
-            "rev-list": "0\t0",
-            "diff": "",
-            "diff-cached": "src/auth.py",
-        })):
-            result = atlas._quick_git_status()
-        assert "Staged" in result
-        assert "src/auth.py" in result
-
-    def test_clean_branch_no_suffix(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "main",
-            "rev-list": "0\t0",
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "ahead" not in result
-        assert "behind" not in result
-        assert "main" in result
-
-    def test_no_upstream_still_shows_branch(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        with patch("subprocess.check_output", side_effect=_mock_git({
-            "rev-parse": "feature/new",
-            "rev-list": "",  # no upstream
-            "diff": "",
-            "diff-cached": "",
-        })):
-            result = atlas._quick_git_status()
-        assert "feature/new" in result
-        assert result != ""
+    @pytest.mark.parametrize(
+        ("output", "expected"),
+        [
+            (_porcelain("main"), "  Branch: main"),
+            (_porcelain("feat/auth", "+2 -0"), "  Branch: feat/auth (2 ahead)"),
+            (_porcelain("feat/auth", "+0 -3"), "  Branch: feat/auth (3 behind)"),
+            (_porcelain("feat/auth", "+1 -2"), "  Branch: feat/auth (1 ahead, 2 behind)"),
+            (
+                _porcelain("main", "+0 -0", unstaged=("src/auth.py", "src/utils.py")),
+                "  Branch: main\n  Modified (unstaged): src/auth.py, src/utils.py",
+            ),
+            (
+                _porcelain("main", "+0 -0", staged=("src/auth.py",)),
+                "  Branch: main\n  Staged: src/auth.py",
+            ),
+            (_porcelain("main", "+0 -0"), "  Branch: main"),
+            (_porcelain("feature/new"), "  Branch: feature/new"),
+        ],
+        ids=[
+            "branch-name",
+            "ahead",
+            "behind",
+            "ahead-and-behind",
+            "unstaged",
+            "staged",
+            "clean-no-suffix",
+            "no-upstream",
+        ],
+    )
+    def test_status_lines(self, atlas, fake_git, output, expected):
+        fake_git.output = output
+        assert atlas._quick_git_status() == expected
+
+    def test_renamed_file_reported_under_new_path(self, atlas, fake_git):
+        record = f"2 R. N... 100644 100644 100644 {_HASH} {_HASH} R100 src/new name.py"
+        fake_git.output = _porcelain("main") + f"{record}\0src/old.py\0".encode()
+        result = atlas._quick_git_status()
+        assert "Staged: src/new name.py" in result
+        assert "old.py" not in result
+
+    def test_untracked_files_not_listed(self, atlas, fake_git):
+        fake_git.output = _porcelain("main") + b"? scratch.txt\0"
+        result = atlas._quick_git_status()
+        assert result == "  Branch: main"
+
+    def test_single_git_invocation(self, atlas, fake_git):
+        fake_git.output = _porcelain("main", "+1 -0")
+        atlas._quick_git_status()
+        assert fake_git.calls == [runtime._GIT_STATUS_ARGV]
+
+    def test_status_argv_takes_no_lock_and_skips_untracked(self):
+        assert runtime._GIT_STATUS_ARGV == (
+            "git",
+            "--no-optional-locks",
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            "-z",
+            "--untracked-files=no",
+        )
+
+    def test_non_utf8_path_does_not_hide_status(self, atlas, fake_git):
+        record = f"1 .M N... 100644 100644 100644 {_HASH} {_HASH} caf".encode()
+        fake_git.output = _porcelain("main") + record + b"\xe9.txt\0"
+        result = atlas._quick_git_status()
+        assert result.startswith("  Branch: main")
+        assert "Modified (unstaged): caf\ufffd.txt" in result
@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-import builtins
 import json
-import os
 import sys
 import time
 from unittest.mock import patch
 
+from atlas import runtime
 from atlas.runtime import Atlas, _relative_time
 
 
@@ -18,16 +17,8 @@ from atlas.runtime import Atlas, _relative_time
 
 
 def _write_history(atlas_dir, lines: list[dict]) -> None:
-    path = os.path.join(str(atlas_dir), "history.jsonl")
-    with open(path, "w") as f:
-        for record in lines:
-            f.write(json.dumps(record) + "\n")
-
-
-def _make_atlas(tmp_path) -> Atlas:
-    atlas_dir = tmp_path / ".atlas"
-    atlas_dir.mkdir()
-    return Atlas(project_dir=str(tmp_path))
+    payload = "".join(json.dumps(record) + "\n" for record in lines)
+    (atlas_dir / "history.jsonl").write_text(payload)
 
 
 # ---------------------------------------------------------------------------
@@ -51,6 +42,14 @@ class TestRelativeTime:
     def test_boundary_one_hour(self):
         assert _relative_time(1000.0, 1000.0 + 3600) == "1h ago"
 
+    def test_boundary_one_minute(self):
+        assert _relative_time(1000.0, 1000.0 + 59) == "just now"
+        assert _relative_time(1000.0, 1000.0 + 60) == "1m ago"
+
+    def test_boundary_one_day(self):
+        assert _relative_time(1000.0, 1000.0 + 86399) == "23h ago"
+        assert _relative_time(1000.0, 1000.0 + 86400) == "1d ago"
+
 
 # ---------------------------------------------------------------------------
 # _read_recent_history
@@ -58,85 +57,102 @@ class TestRelativeTime:
 
 
 class TestReadRecentHistory:
-    def test_returns_empty_when_no_file(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_returns_empty_when_no_file(self, atlas):
         assert atlas._read_recent_history() == []
 
-    def test_returns_entries_in_order(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_returns_entries_in_order(self, atlas, fresh_dir):
         now = time.time()
         records = [
             {"ts": now - 7200, "summary": "first op"},
             {"ts": now - 3600, "summary": "second op"},
             {"ts": now - 60, "summary": "third op"},
         ]
-        _write_history(tmp_path / ".atlas", records)
+        _write_history(fresh_dir / ".atlas", records)
         result = atlas._read_recent_history()
         assert len(result) == 3
         assert result[0]["summary"] == "first op"
         assert result[2]["summary"] == "third op"
 
-    def test_respects_limit(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_respects_limit(self, atlas, fresh_dir):
         now = time.time()
         records = [{"ts": now - i * 60, "summary": f"op {i}"} for i in range(10, 0, -1)]
-        _write_history(tmp_path / ".atlas", records)
+        _write_history(fresh_dir / ".atlas", records)
         result = atlas._read_recent_history(limit=3)
         assert len(result) == 3
         # Last 3 entries in the file
         assert result[-1]["summary"] == "op 1"
 
-    def test_skips_malformed_lines(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_skips_malformed_lines(self, atlas, fresh_dir):
         now = time.time()
-        path = os.path.join(str(tmp_path / ".atlas"), "history.jsonl")
+        good = json.dumps({"ts": now - 60, "summary": "good op"})
         # _write_history only produces valid JSON, so we write directly here
-        with open(path, "w") as f:
-            f.write('{"ts": ' + str(now - 60) + ', "summary": "good op"}\n')
-            f.write("not valid json\n")
+        (fresh_dir / ".atlas" / "history.jsonl").write_text(good + "\nnot valid json\n")
         result = atlas._read_recent_history()
         assert len(result) == 1
         assert result[0]["summary"] == "good op"
 
-    def test_skips_entries_without_summary(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_skips_undecodable_lines(self, atlas, fresh_dir):
+        good = json.dumps({"ts": time.time() - 60, "summary": "good op"}).encode()
+        (fresh_dir / ".atlas" / "history.jsonl").write_bytes(b"\xff\xfe\n" + good + b"\n")
+        result = atlas._read_recent_history()
+        assert [e["summary"] for e in result] == ["good op"]
+
+    def test_blank_lines_do_not_count_toward_limit(self, atlas, fresh_dir):
+        now = time.time()
+        lines = [json.dumps({"ts": now, "summary": f"op {i}"}) for i in range(3)]
+        (fresh_dir / ".atlas" / "history.jsonl").write_text("\n\n".join(lines) + "\n\n")
+        result = atlas._read_recent_history(limit=2)
+        assert [e["summary"] for e in result] == ["op 1", "op 2"]
+
+    def test_tail_spanning_several_blocks(self, atlas, fresh_dir, monkeypatch):
+        # Tiny blocks force the backwards read to stitch lines across block edges
+        monkeypatch.setattr(runtime, "_TAIL_BLOCK", 16)
+        now = time.time()
+        records = [{"ts": now, "summary": f"op {i}"} for i in range(20)]
+        _write_history(fresh_dir / ".atlas", records)
+        result = atlas._read_recent_history(limit=4)
+        assert [e["summary"] for e in result] == ["op 16", "op 17", "op 18", "op 19"]
+
+    def test_limit_larger_than_file(self, atlas, fresh_dir, monkeypatch):
+        monkeypatch.setattr(runtime, "_TAIL_BLOCK", 16)
+        now = time.time()
+        _write_history(fresh_dir / ".atlas", [{"ts": now, "summary": f"op {i}"} for i in range(3)])
+        result = atlas._read_recent_history(limit=10)
+        assert [e["summary"] for e in result] == ["op 0", "op 1", "op 2"]
+
+    def test_skips_entries_without_summary(self, atlas, fresh_dir):
         now = time.time()
         records = [
             {"ts": now - 120, "summary": ""},
             {"ts": now - 60, "summary": "has summary"},
         ]
-        _write_history(tmp_path / ".atlas", records)
+        _write_history(fresh_dir / ".atlas", records)
         result = atlas._read_recent_history()
         assert len(result) == 1
         assert result[0]["summary"] == "has summary"
 
-    def test_ago_field_is_relative_string(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_ago_field_is_relative_string(self, atlas, fresh_dir):
         now = time.time()
-        _write_history(tmp_path / ".atlas", [{"ts": now - 7200, "summary": "ran tests"}])
+        _write_history(fresh_dir / ".atlas", [{"ts": now - 7200, "summary": "ran tests"}])
         result = atlas._read_recent_history()
         assert len(result) == 1
         assert result[0]["ago"] == "2h ago"
         assert result[0]["summary"] == "ran tests"
 
-    def test_missing_ts_field_uses_question_mark(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        _write_history(tmp_path / ".atlas", [{"summary": "op with no timestamp"}])
+    def test_missing_ts_field_uses_question_mark(self, atlas, fresh_dir):
+        _write_history(fresh_dir / ".atlas", [{"summary": "op with no timestamp"}])
         result = atlas._read_recent_history()
         assert len(result) == 1
         assert result[0]["ago"] == "?"
         assert result[0]["summary"] == "op with no timestamp"
 
-    def test_returns_empty_when_file_unreadable(self, tmp_path, monkeypatch):
-        atlas = _make_atlas(tmp_path)
-        real_open = builtins.open
-        def mock_open(path, *args, **kwargs):
-            if "history.jsonl" in str(path):
-                raise OSError("permission denied")
-            return real_open(path, *args, **kwargs)
-        # Create the file so the isfile() check passes
-        (tmp_path / ".atlas" / "history.jsonl").write_text('{"ts": 1.0, "summary": "x"}\n')
-        monkeypatch.setattr(builtins, "open", mock_open)
+    def test_returns_empty_when_file_unreadable(self, atlas, fresh_dir, monkeypatch):
+        def deny_open(path, *args, **kwargs):
+            raise PermissionError("permission denied")
+        # Create the file so the failure comes from open(), not a missing path
+        (fresh_dir / ".atlas" / "history.jsonl").write_text('{"ts": 1.0, "summary": "x"}\n')
+        # Shadow open() for atlas.runtime only; builtins stay untouched
+        monkeypatch.setattr(runtime, "open", deny_open, raising=False)
         result = atlas._read_recent_history()
         assert result == []
 
@@ -147,44 +163,39 @@ class TestReadRecentHistory:
 
 
 class TestAppendHistory:
-    def test_creates_history_file_when_absent(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_creates_history_file_when_absent(self, atlas, fresh_dir):
         atlas._append_history("test operation")
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
 
-    def test_writes_valid_json_line(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_writes_valid_json_line(self, atlas, fresh_dir):
         atlas._append_history("did something")
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         line = path.read_text().strip()
         record = json.loads(line)
         assert record["summary"] == "did something"
         assert isinstance(record["ts"], float)
 
-    def test_ts_is_approximately_now(self, tmp_path):
+    def test_ts_is_approximately_now(self, atlas, fresh_dir):
         before = time.time()
-        atlas = _make_atlas(tmp_path)
         atlas._append_history("timed op")
         after = time.time()
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         record = json.loads(path.read_text().strip())
         assert before <= record["ts"] <= after
 
-    def test_appends_multiple_entries(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_appends_multiple_entries(self, atlas, fresh_dir):
         atlas._append_history("first")
         atlas._append_history("second")
         atlas._append_history("third")
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         lines = [ln for ln in path.read_text().splitlines() if ln.strip()]
         assert len(lines) == 3
         summaries = [json.loads(ln)["summary"] for ln in lines]
         assert summaries == ["first", "second", "third"]
 
-    def test_does_not_rewrite_existing_entries(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
-        path = tmp_path / ".atlas" / "history.jsonl"
+    def test_does_not_rewrite_existing_entries(self, atlas, fresh_dir):
+        path = fresh_dir / ".atlas" / "history.jsonl"
         path.write_text(json.dumps({"ts": 1000.0, "summary": "existing"}) + "\n")
         atlas._append_history("new entry")
         lines = [ln for ln in path.read_text().splitlines() if ln.strip()]
@@ -192,11 +203,11 @@ class TestAppendHistory:
         assert json.loads(lines[0])["summary"] == "existing"
         assert json.loads(lines[1])["summary"] == "new entry"
 
-    def test_skips_when_not_initialized(self, tmp_path):
+    def test_skips_when_not_initialized(self, fresh_dir):
         """No .atlas/ dir — should not crash and not create file."""
-        atlas = Atlas(project_dir=str(tmp_path))
+        atlas = Atlas(project_dir=str(fresh_dir))
         atlas._append_history("should not write")
-        assert not (tmp_path / ".atlas" / "history.jsonl").exists()
+        assert not (fresh_dir / ".atlas" / "history.jsonl").exists()
 
 
 # ---------------------------------------------------------------------------
@@ -205,8 +216,7 @@ class TestAppendHistory:
 
 
 class TestAddModulesHistory:
-    def test_history_written_when_module_installed(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_history_written_when_module_installed(self, atlas, fresh_dir):
         atlas._manifest = {"installed_modules": {}, "detected": {}}
         atlas._registry = {"modules": {}}
 
@@ -214,13 +224,12 @@ class TestAddModulesHistory:
         with patch("atlas.runtime.install_module", return_value=fake_ok):
             atlas.add_modules(["ruff"])
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
         record = json.loads(path.read_text().strip())
         assert "ruff" in record["summary"]
 
-    def test_no_history_when_all_installs_fail(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_no_history_when_all_installs_fail(self, atlas, fresh_dir):
         atlas._manifest = {"installed_modules": {}, "detected": {}}
         atlas._registry = {"modules": {}}
 
@@ -228,7 +237,7 @@ class TestAddModulesHistory:
         with patch("atlas.runtime.install_module", return_value=fake_fail):
             atlas.add_modules(["nonexistent"])
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert not path.is_file()
 
 
@@ -238,8 +247,7 @@ class TestAddModulesHistory:
 
 
 class TestRemoveModuleHistory:
-    def test_history_written_on_successful_remove(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_history_written_on_successful_remove(self, atlas, fresh_dir):
         atlas._manifest = {"installed_modules": {"ruff": {}}}
         atlas._registry = {"modules": {}}
 
@@ -247,13 +255,12 @@ class TestRemoveModuleHistory:
         with patch("atlas.runtime.remove_module", return_value=fake_ok):
             atlas.remove_module("ruff")
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
         record = json.loads(path.read_text().strip())
         assert "ruff" in record["summary"]
 
-    def test_no_history_on_failed_remove(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_no_history_on_failed_remove(self, atlas, fresh_dir):
         atlas._manifest = {"installed_modules": {}}
         atlas._registry = {"modules": {}}
 
@@ -261,7 +268,7 @@ class TestRemoveModuleHistory:
         with patch("atlas.runtime.remove_module", return_value=fake_fail):
             atlas.remove_module("nonexistent")
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert not path.is_file()
 
 
@@ -271,32 +278,31 @@ class TestRemoveModuleHistory:
 
 
 class TestJustHistory:
-    def test_history_written_after_task_runs(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
+    def test_history_written_after_task_runs(self, fresh_dir):
+        atlas_dir = fresh_dir / ".atlas"
         (atlas_dir / "modules").mkdir(parents=True)
-        atlas = Atlas(project_dir=str(tmp_path))
+        atlas = Atlas(project_dir=str(fresh_dir))
         atlas._manifest = {"installed_modules": {"mypkg": {}}, "detected": {}}
         mod_path = atlas_dir / "modules" / "mypkg.json"
         mod_path.write_text(json.dumps({"commands": {"hello": f"{sys.executable} -c \"print('hi')\""}}))
 
         atlas.just("hello")
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
         record = json.loads(path.read_text().strip())
         assert "hello" in record["summary"]
 
-    def test_no_history_when_task_not_found(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_no_history_when_task_not_found(self, atlas, fresh_dir):
         atlas._manifest = {"installed_modules": {}}
         atlas.just("nonexistent_task")
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert not path.is_file()
 
-    def test_history_written_when_task_exits_nonzero(self, tmp_path):
-        atlas_dir = tmp_path / ".atlas"
+    def test_history_written_when_task_exits_nonzero(self, fresh_dir):
+        atlas_dir = fresh_dir / ".atlas"
         (atlas_dir / "modules").mkdir(parents=True)
-        atlas = Atlas(project_dir=str(tmp_path))
+        atlas = Atlas(project_dir=str(fresh_dir))
         atlas._manifest = {"installed_modules": {"mypkg": {}}, "detected": {}}
         mod_path = atlas_dir / "modules" / "mypkg.json"
         # Exit with code 1 (simulates a linter finding violations)
@@ -304,7 +310,7 @@ class TestJustHistory:
 
         atlas.just("check")
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file(), "history should be written even when task exits non-zero"
         record = json.loads(path.read_text().strip())
         assert "check" in record["summary"]
@@ -316,30 +322,27 @@ class TestJustHistory:
 
 
 class TestNoteHistory:
-    def test_add_note_writes_history(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_add_note_writes_history(self, atlas, fresh_dir):
         atlas.add_note("python", "use async")
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
         record = json.loads(path.read_text().strip())
         assert "python" in record["summary"]
 
-    def test_remove_note_writes_history(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_remove_note_writes_history(self, atlas, fresh_dir):
         atlas.add_note("python", "use async")
         # Clear history written by add_note
-        (tmp_path / ".atlas" / "history.jsonl").unlink()
+        (fresh_dir / ".atlas" / "history.jsonl").unlink()
 
         atlas.remove_note("python", 0)
 
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert path.is_file()
         record = json.loads(path.read_text().strip())
         assert "python" in record["summary"]
 
-    def test_remove_note_no_history_on_failure(self, tmp_path):
-        atlas = _make_atlas(tmp_path)
+    def test_remove_note_no_history_on_failure(self, atlas, fresh_dir):
         # remove_note on empty notes should fail → no history
         atlas.remove_note("python", 0)
-        path = tmp_path / ".atlas" / "history.jsonl"
+        path = fresh_dir / ".atlas" / "history.jsonl"
         assert not path.is_file()
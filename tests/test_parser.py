@@ -34,6 +34,9 @@ class TestParsedInput:
         a.contexts.append(["python"])
         assert b.contexts == []
 
+    def test_slotted_no_instance_dict(self):
+        assert not hasattr(ParsedInput(), "__dict__")
+
     def test_can_construct_with_all_fields(self):
         p = ParsedInput(
             verb="add",
@@ -127,6 +130,10 @@ class TestParseContextQueries:
         result = parse_input("python ,  svelte")
         assert result.contexts == [["python"], ["svelte"]]
 
+    def test_empty_comma_groups_dropped(self):
+        result = parse_input("python,, svelte,")
+        assert result.contexts == [["python"], ["svelte"]]
+
     def test_leading_trailing_whitespace_trimmed(self):
         result = parse_input("  python linter  ")
         assert result.contexts == [["python", "linter"]]
@@ -157,6 +164,11 @@ class TestParseDoubleDash:
         assert result.contexts == [["prompt", "design"]]
         assert result.message == "src/auth.py"
 
+    def test_only_first_double_dash_separates(self):
+        result = parse_input("python -- run a -- b")
+        assert result.contexts == [["python"]]
+        assert result.message == "run a -- b"
+
     def test_no_double_dash_message_is_none(self):
         result = parse_input("python linter")
         assert result.message is None
@@ -47,6 +47,12 @@ class TestLoadRegistry:
         result = load_registry(str(f))
         assert result == {}
 
+    def test_undecodable_bytes_return_empty_dict(self, tmp_path):
+        f = tmp_path / "registry.json"
+        f.write_bytes(b'{"modules": "\xff"}')
+        result = load_registry(str(f))
+        assert result == {}
+
     def test_directory_path_returns_empty_dict(self, tmp_path):
         # tmp_path is a directory, not a file
         result = load_registry(str(tmp_path))